@@ -19,7 +19,7 @@ def parse_cli_args() -> Dict[str, Any]:
         parser.error("--csv_file, --encoder, and --decoder are required.")
     return vars(args)
 
-def parse_args():
+def parse_args(argv=None):
     parser = argparse.ArgumentParser(description="Predictor: A tool for timeseries prediction with plugin support.")
     parser.add_argument('--x_train_file', type=str, help='Path to the input CSV file that is used for training the model (x_train).')
     parser.add_argument('-ytf', '--y_train_file', type=str, help='Path to the input CSV file that is used for training the model (y_train), IMPORTANT: it is not shifted, must coincide 1 to 1|with the training data.')
@@ -61,4 +61,4 @@ def parse_args():
 
 
 
-    return parser.parse_known_args()
+    return parser.parse_known_args(argv)
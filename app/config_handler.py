@@ -21,18 +21,23 @@ class ConfigHandler:
     Handles configuration loading and merging from CLI, file, and remote sources.
     Maintains config integrity and provides checksum calculation.
     """
-    def __init__(self, default_file_path: str = None, override_file_path: str = None, cli_args: Dict[str, Any] = None, remote_url: str = None):
+    def __init__(self, default_file_path: str = None, override_file_path: str = None, cli_args: Dict[str, Any] = None, remote_url: str = None,
+                 default_dict: Dict[str, Any] = None, override_dict: Dict[str, Any] = None):
         self.config = {}
 
-        # 1. Load defaults from file
+        # 1. Load defaults from file or dict
         if default_file_path and os.path.exists(default_file_path):
             with open(default_file_path) as f:
                 self.config.update(json.load(f))
+        if default_dict:
+            self.config.update(default_dict)
 
-        # 2. Load overrides from file
+        # 2. Load overrides from file or dict
         if override_file_path and os.path.exists(override_file_path):
             with open(override_file_path) as f:
                 self.config.update(json.load(f))
+        if override_dict:
+            self.config.update(override_dict)
         
         # 3. Load from remote
         if remote_url:
@@ -51,6 +56,16 @@ class ConfigHandler:
 
         self.checksum = self._calc_checksum()
 
+    @classmethod
+    def from_dicts(cls, default: Dict[str, Any], override: Dict[str, Any] = None, **kwargs):
+        """
+        Build a handler from in-memory default and override configs instead of files.
+        :param default: Default config dict.
+        :param override: Override config dict.
+        :return: ConfigHandler instance.
+        """
+        return cls(default_dict=default, override_dict=override, **kwargs)
+
     def get_config(self):
         return self.config
 
@@ -16,7 +16,7 @@ authentication, authorization, accounting, and all trading components.
 """
 
 import sys
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Sequence
 import logging
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -89,14 +89,17 @@ def setup_logging(config: Dict[str, Any]):
     )
     return logging.getLogger(__name__)
 
-def main():
+def main(argv: Optional[Sequence[str]] = None) -> int:
     """
     Orchestrates the execution of the LTS (Live Trading System).
+
+    *argv* defaults to ``sys.argv[1:]``; returns the process exit code so the
+    CLI can also be driven in-process.
     """
     logger.info("--- Initializing LTS (Live Trading System) ---")
 
     # 1. Configuration Loading
-    args, unknown_args = parse_args()
+    args, unknown_args = parse_args(argv)
     cli_args: Dict[str, Any] = vars(args)
     config: Dict[str, Any] = DEFAULT_VALUES.copy()
     file_config: Dict[str, Any] = {}
@@ -107,7 +110,7 @@ def main():
             logger.info("Loaded local config from: %s", args.load_config)
         except Exception as e:
             logger.error("Failed to load local configuration: %s", e)
-            sys.exit(1)
+            return 1
 
     # First merge pass (without plugin-specific parameters)
     logger.info("Merging configuration (first pass)...")
@@ -131,7 +134,7 @@ def main():
             plugins[plugin_type] = plugin_instance
         except Exception as e:
             logger.error("Failed to load or initialize %s Plugin '%s': %s", plugin_type.capitalize(), plugin_name, e)
-            sys.exit(1)
+            return 1
 
     # Second merge pass (with all plugin parameters)
     logger.info("Merging configuration (second pass, with plugin params)...")
@@ -142,7 +145,7 @@ def main():
     pipeline_plugin = plugins.get('pipeline')
     if not pipeline_plugin:
         logger.error("Fatal: Pipeline plugin not found. Cannot start application.")
-        sys.exit(1)
+        return 1
     
     # Pass all loaded plugins to the pipeline
     pipeline_plugin.set_plugins(plugins)
@@ -153,7 +156,8 @@ def main():
     except Exception as e:
         logger.error("An unexpected error occurred while starting the pipeline plugin: %s", e)
         pipeline_plugin.stop()
-        sys.exit(1)
+        return 1
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -7,12 +7,52 @@ handling both real prediction requests and CSV-based test mode for perfect predi
 
 import json
 import logging
+import os
 import pandas as pd
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Dict, List, Any, Optional, Tuple
 import asyncio
 import httpx
-from pathlib import Path
+from contextlib import asynccontextmanager
+
+try:
+    from ciso8601 import parse_datetime as _parse_iso
+except ImportError:
+    _parse_iso = datetime.fromisoformat
+
+
+def _parse_datetime(value):
+    """
+    Parse a prediction timestamp, taking the C ISO-8601 parsers first.
+    
+    Accepts datetime objects as-is; strings the ISO parser rejects go
+    through pandas' flexible parser.
+    """
+    if isinstance(value, datetime):
+        return value
+    try:
+        return _parse_iso(value)
+    except ValueError:
+        return pd.to_datetime(value)
+
+
+@lru_cache(maxsize=8)
+def _load_csv(path_str: str, mtime: float) -> pd.DataFrame:
+    """
+    Parse a CSV test-data file indexed by DATE_TIME.
+    
+    Cached per (path, mtime), so clients share one frame until the file
+    changes; callers must treat the result as read-only.
+    """
+    try:
+        df = pd.read_csv(path_str, engine='pyarrow')
+    except (ImportError, ValueError):
+        # pyarrow missing, or input it rejects: defer to the default parser
+        df = pd.read_csv(path_str)
+    df['DATE_TIME'] = pd.to_datetime(df['DATE_TIME'])
+    df.set_index('DATE_TIME', inplace=True)
+    return df
 
 
 class PredictionProviderClient:
@@ -22,14 +62,18 @@ class PredictionProviderClient:
     Supports both real prediction API calls and CSV test mode for perfect predictions.
     """
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], client: Optional[httpx.AsyncClient] = None):
         """
         Initialize the prediction provider client.
         
         Args:
             config: Configuration dictionary with prediction provider settings
+            client: Optional shared httpx.AsyncClient; when given, every API call
+                reuses its connection pool instead of opening a new client. The
+                caller owns it and is responsible for closing it.
         """
         self.config = config
+        self.client = client
         self.logger = logging.getLogger(__name__)
         
         # Prediction provider settings
@@ -56,19 +100,29 @@ class PredictionProviderClient:
     def _load_csv_data(self):
         """Load CSV data for test mode."""
         try:
-            csv_path = Path(self.csv_test_data_path)
-            if csv_path.exists():
-                self.csv_data = pd.read_csv(csv_path)
-                self.csv_data['DATE_TIME'] = pd.to_datetime(self.csv_data['DATE_TIME'])
-                self.csv_data.set_index('DATE_TIME', inplace=True)
-                self.logger.info(f"Loaded CSV test data from {csv_path} with {len(self.csv_data)} rows")
-            else:
-                self.logger.error(f"CSV test data file not found: {csv_path}")
+            csv_path = str(self.csv_test_data_path)
+            # One stat both checks existence and supplies the cache key
+            try:
+                mtime = os.stat(csv_path).st_mtime
+            except FileNotFoundError:
+                self.logger.error("CSV test data file not found: %s", csv_path)
                 self.csv_test_mode = False
+                return
+            self.csv_data = _load_csv(csv_path, mtime)
+            self.logger.info("Loaded CSV test data from %s with %d rows", csv_path, len(self.csv_data))
         except Exception as e:
-            self.logger.error(f"Failed to load CSV test data: {e}")
+            self.logger.error("Failed to load CSV test data: %s", e)
             self.csv_test_mode = False
     
+    @asynccontextmanager
+    async def _http_client(self, timeout: float):
+        """Yield the shared client if one was injected, else a short-lived one."""
+        if self.client is not None:
+            yield self.client
+        else:
+            async with httpx.AsyncClient(timeout=timeout) as client:
+                yield client
+    
     async def get_predictions(self, symbol: str, datetime_str: str, 
                             prediction_types: List[str] = None) -> Dict[str, Any]:
         """
@@ -107,7 +161,7 @@ class PredictionProviderClient:
             raise ValueError("CSV data not loaded for test mode")
         
         try:
-            query_time = pd.to_datetime(datetime_str)
+            query_time = _parse_datetime(datetime_str)
             
             # Find the closest timestamp in the data
             closest_idx = self.csv_data.index.get_indexer([query_time], method='nearest')[0]
@@ -208,11 +262,11 @@ class PredictionProviderClient:
                 'count': len(historical_data)
             }
             
-            self.logger.info(f"Generated CSV test predictions for {symbol} at {datetime_str}")
+            self.logger.info("Generated CSV test predictions for %s at %s", symbol, datetime_str)
             return result
             
         except Exception as e:
-            self.logger.error(f"Error generating CSV predictions: {e}")
+            self.logger.error("Error generating CSV predictions: %s", e)
             raise
     
     async def _get_api_predictions(self, symbol: str, datetime_str: str, 
@@ -244,7 +298,7 @@ class PredictionProviderClient:
                 results['predictions'][pred_type] = prediction_data.get('predictions', [])
                 results['uncertainties'][pred_type] = prediction_data.get('uncertainties', [])
             except Exception as e:
-                self.logger.error(f"Failed to get {pred_type} predictions: {e}")
+                self.logger.error("Failed to get %s predictions: %s", pred_type, e)
                 results['predictions'][pred_type] = []
                 results['uncertainties'][pred_type] = []
                 results['status'] = 'partial_failure'
@@ -283,12 +337,13 @@ class PredictionProviderClient:
         prediction_response = None
         for attempt in range(self.retries):
             try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
+                async with self._http_client(self.timeout) as client:
                     # Create prediction request
                     response = await client.post(
                         f"{self.base_url}/api/v1/predict",
                         json=request_data,
-                        headers=headers
+                        headers=headers,
+                        timeout=self.timeout
                     )
                     if response.status_code in [200, 201]:
                         prediction_response = response.json()
@@ -298,7 +353,7 @@ class PredictionProviderClient:
                         raise Exception(f"API request failed with status {response.status_code}: {error_text}")
             
             except Exception as e:
-                self.logger.warning(f"Prediction request attempt {attempt + 1} failed: {e}")
+                self.logger.warning("Prediction request attempt %d failed: %s", attempt + 1, e)
                 if attempt < self.retries - 1:
                     await asyncio.sleep(self.retry_delay)
                 else:
@@ -319,10 +374,11 @@ class PredictionProviderClient:
         
         while total_wait < max_wait_time:
             try:
-                async with httpx.AsyncClient(timeout=30) as client:
+                async with self._http_client(30) as client:
                     status_response = await client.get(
                         f"{self.base_url}/api/v1/predictions/{prediction_id}",
-                        headers=headers
+                        headers=headers,
+                        timeout=30
                     )
                     if status_response.status_code == 200:
                         status_data = status_response.json()
@@ -357,7 +413,7 @@ class PredictionProviderClient:
                     else:
                         raise Exception(f"Status check failed with status {status_response.status_code}: {status_response.text}")
             except Exception as e:
-                self.logger.warning(f"Status check attempt failed: {e}")
+                self.logger.warning("Status check attempt failed: %s", e)
                 await asyncio.sleep(poll_interval)
                 total_wait += poll_interval
         
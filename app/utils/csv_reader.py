@@ -0,0 +1,22 @@
+"""
+csv_reader.py
+
+CSV parsing shared by the CSV feeder and predictor plugins.
+"""
+
+import pandas as pd
+
+
+def read_csv(csv_file: str) -> pd.DataFrame:
+    """
+    Parse *csv_file*, preferring pandas' multithreaded pyarrow engine.
+
+    Price columns stay float64: the predictor's returns are checked to
+    1e-10 against the CSV values, which float32 (about 7 significant
+    digits) cannot represent.
+    """
+    try:
+        return pd.read_csv(csv_file, engine="pyarrow")
+    except (ImportError, ValueError):
+        # pyarrow missing, or input it rejects: defer to the default parser
+        return pd.read_csv(csv_file)
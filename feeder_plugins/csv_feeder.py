@@ -9,6 +9,8 @@ import pandas as pd
 from datetime import datetime
 from typing import Dict, Any, Optional
 
+from app.utils.csv_reader import read_csv
+
 
 class CSVFeeder:
     """
@@ -41,7 +43,7 @@ class CSVFeeder:
         if not os.path.exists(csv_file):
             raise FileNotFoundError(f"CSV file not found: {csv_file}")
 
-        df = pd.read_csv(csv_file)
+        df = read_csv(csv_file)
         df[self.datetime_column] = pd.to_datetime(df[self.datetime_column])
         df.set_index(self.datetime_column, inplace=True)
         df.sort_index(inplace=True)
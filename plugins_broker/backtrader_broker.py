@@ -9,7 +9,7 @@ import backtrader as bt
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Mapping, Optional, Any, Union
 import logging
 import requests
 import os
@@ -362,13 +362,14 @@ class BacktraderBroker(bt.brokers.BackBroker):
             "prediction_usage": self.predictions_used
         }
     
-    def switch_prediction_source(self, new_source: str, config_updates: Optional[Dict] = None):
+    def switch_prediction_source(self, new_source: str, config_updates: Optional[Mapping[str, Any]] = None):
         """
         Switch between prediction sources during runtime.
         
         Args:
             new_source: New prediction source ("csv" or "api")
-            config_updates: Optional configuration updates
+            config_updates: Optional configuration updates; read-only, merged
+                into the broker config without copying (a MappingProxyType works)
         """
         if new_source not in ["csv", "api"]:
             raise ValueError(f"Invalid prediction source: {new_source}")
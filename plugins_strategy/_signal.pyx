@@ -0,0 +1,90 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+Compiled entry-signal kernel for the heuristic strategy.
+
+Typed mirror of ``heuristic_strategy._signal_core``. ``signal_core`` releases
+the GIL around the arithmetic, so several instruments can be evaluated from a
+thread pool.
+"""
+
+
+def signal_core(
+    const double[::1] preds,
+    double current_price,
+    double pip_cost,
+    double profit_threshold,
+    double min_drawdown_pips,
+    double tp_multiplier,
+    double sl_multiplier,
+):
+    cdef (int, double, double, double, double) result
+    with nogil:
+        result = _signal_core(
+            preds, current_price, pip_cost, profit_threshold,
+            min_drawdown_pips, tp_multiplier, sl_multiplier,
+        )
+    return result
+
+
+cdef (int, double, double, double, double) _signal_core(
+    const double[::1] preds,
+    double current_price,
+    double pip_cost,
+    double profit_threshold,
+    double min_drawdown_pips,
+    double tp_multiplier,
+    double sl_multiplier,
+) noexcept nogil:
+    cdef Py_ssize_t i
+    cdef Py_ssize_t n = preds.shape[0]
+    cdef double hi, lo, p
+    cdef double profit_buy, drawdown_buy, rr_buy
+    cdef double profit_sell, drawdown_sell, rr_sell
+
+    if n == 0:
+        return 0, 0.0, 0.0, 0.0, 0.0
+
+    hi = preds[0]
+    lo = preds[0]
+    for i in range(1, n):
+        p = preds[i]
+        if p > hi:
+            hi = p
+        elif p < lo:
+            lo = p
+
+    profit_buy = (hi - current_price) / pip_cost
+    profit_sell = (current_price - lo) / pip_cost
+    # Flat predictions fail both thresholds; skip the RR/TP/SL arithmetic
+    if profit_buy < profit_threshold and profit_sell < profit_threshold:
+        return 0, 0.0, 0.0, 0.0, 0.0
+
+    # --- Long entry conditions ---
+    drawdown_buy = (current_price - lo) / pip_cost
+    if drawdown_buy < min_drawdown_pips:
+        drawdown_buy = min_drawdown_pips
+    rr_buy = profit_buy / drawdown_buy if drawdown_buy > 0 else 0.0
+
+    # --- Short entry conditions ---
+    drawdown_sell = (hi - current_price) / pip_cost
+    if drawdown_sell < min_drawdown_pips:
+        drawdown_sell = min_drawdown_pips
+    rr_sell = profit_sell / drawdown_sell if drawdown_sell > 0 else 0.0
+
+    if profit_buy >= profit_threshold and rr_buy >= rr_sell:
+        return (
+            1,
+            current_price + tp_multiplier * profit_buy * pip_cost,
+            current_price - sl_multiplier * drawdown_buy * pip_cost,
+            rr_buy,
+            profit_buy,
+        )
+    if profit_sell >= profit_threshold and rr_sell > rr_buy:
+        return (
+            -1,
+            current_price - tp_multiplier * profit_sell * pip_cost,
+            current_price + sl_multiplier * drawdown_sell * pip_cost,
+            rr_sell,
+            profit_sell,
+        )
+    return 0, 0.0, 0.0, 0.0, 0.0
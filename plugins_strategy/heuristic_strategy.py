@@ -6,7 +6,8 @@ Computes entry signals (long/short/hold) with TP/SL from daily predictions,
 and exit signals using variant-based early close logic from hourly+daily predictions.
 """
 
-from typing import Dict, Any, List, Optional
+from array import array
+from typing import Dict, Any, List, Optional, Tuple
 
 # Default parameters matching the heuristic-strategy plugin
 DEFAULT_PARAMS = {
@@ -29,6 +30,67 @@ DEFAULT_PARAMS = {
     'swap_per_lot_per_day': 10.0,
 }
 
+# Side codes returned by the signal kernel
+_SIDE_HOLD = 0
+_SIDE_BUY = 1
+_SIDE_SELL = -1
+
+
+def _signal_core(
+    preds,
+    current_price: float,
+    pip_cost: float,
+    profit_threshold: float,
+    min_drawdown_pips: float,
+    tp_multiplier: float,
+    sl_multiplier: float,
+) -> Tuple[int, float, float, float, float]:
+    """
+    Entry-signal kernel: one pass for hi/lo, then the long/short RR arithmetic.
+
+    Returns (side, tp, sl, rr, profit_pips). Pure-Python reference for the
+    compiled ``plugins_strategy._signal`` extension, which replaces it when built.
+    """
+    hi = lo = preds[0]
+    for p in preds:
+        if p > hi:
+            hi = p
+        elif p < lo:
+            lo = p
+
+    ideal_profit_pips_buy = (hi - current_price) / pip_cost
+    ideal_profit_pips_sell = (current_price - lo) / pip_cost
+    # Flat predictions fail both thresholds; skip the RR/TP/SL arithmetic
+    if ideal_profit_pips_buy < profit_threshold and ideal_profit_pips_sell < profit_threshold:
+        return _SIDE_HOLD, 0.0, 0.0, 0.0, 0.0
+
+    # --- Long entry conditions ---
+    ideal_drawdown_pips_buy = max((current_price - lo) / pip_cost, min_drawdown_pips)
+    rr_buy = ideal_profit_pips_buy / ideal_drawdown_pips_buy if ideal_drawdown_pips_buy > 0 else 0.0
+
+    # --- Short entry conditions ---
+    ideal_drawdown_pips_sell = max((hi - current_price) / pip_cost, min_drawdown_pips)
+    rr_sell = ideal_profit_pips_sell / ideal_drawdown_pips_sell if ideal_drawdown_pips_sell > 0 else 0.0
+
+    if ideal_profit_pips_buy >= profit_threshold and rr_buy >= rr_sell:
+        tp = current_price + tp_multiplier * ideal_profit_pips_buy * pip_cost
+        sl = current_price - sl_multiplier * ideal_drawdown_pips_buy * pip_cost
+        return _SIDE_BUY, tp, sl, rr_buy, ideal_profit_pips_buy
+    if ideal_profit_pips_sell >= profit_threshold and rr_sell > rr_buy:
+        tp = current_price - tp_multiplier * ideal_profit_pips_sell * pip_cost
+        sl = current_price + sl_multiplier * ideal_drawdown_pips_sell * pip_cost
+        return _SIDE_SELL, tp, sl, rr_sell, ideal_profit_pips_sell
+    return _SIDE_HOLD, 0.0, 0.0, 0.0, 0.0
+
+
+try:
+    # Optional Cython build of the kernel above (see setup.py)
+    from plugins_strategy._signal import signal_core as _signal_core
+except ImportError:
+    _COMPILED_KERNEL = False
+else:
+    _COMPILED_KERNEL = True
+
 
 def compute_signal(
     current_price: float,
@@ -49,8 +111,6 @@ def compute_signal(
     min_drawdown_pips = cfg['min_drawdown_pips']
     tp_multiplier = cfg['tp_multiplier']
     sl_multiplier = cfg['sl_multiplier']
-    lower_rr = cfg['lower_rr_threshold']
-    upper_rr = cfg['upper_rr_threshold']
 
     if not daily_predictions or all(p is None for p in daily_predictions):
         return {"action": "hold", "reason": "no daily predictions", "tp": 0, "sl": 0, "volume": 0}
@@ -59,39 +119,16 @@ def compute_signal(
     if not daily_preds:
         return {"action": "hold", "reason": "empty daily predictions", "tp": 0, "sl": 0, "volume": 0}
 
-    # --- Long entry conditions ---
-    ideal_profit_pips_buy = (max(daily_preds) - current_price) / pip_cost
-    ideal_drawdown_pips_buy = max(
-        (current_price - min(daily_preds)) / pip_cost,
-        min_drawdown_pips
+    # The compiled kernel takes a double buffer; the Python one iterates the list
+    preds = array('d', daily_preds) if _COMPILED_KERNEL else daily_preds
+    side, chosen_tp, chosen_sl, chosen_rr, profit_pips = _signal_core(
+        preds, current_price, pip_cost, profit_threshold,
+        min_drawdown_pips, tp_multiplier, sl_multiplier,
     )
-    rr_buy = ideal_profit_pips_buy / ideal_drawdown_pips_buy if ideal_drawdown_pips_buy > 0 else 0
-    tp_buy = current_price + tp_multiplier * ideal_profit_pips_buy * pip_cost
-    sl_buy = current_price - sl_multiplier * ideal_drawdown_pips_buy * pip_cost
-
-    # --- Short entry conditions ---
-    ideal_profit_pips_sell = (current_price - min(daily_preds)) / pip_cost
-    ideal_drawdown_pips_sell = max(
-        (max(daily_preds) - current_price) / pip_cost,
-        min_drawdown_pips
-    )
-    rr_sell = ideal_profit_pips_sell / ideal_drawdown_pips_sell if ideal_drawdown_pips_sell > 0 else 0
-    tp_sell = current_price - tp_multiplier * ideal_profit_pips_sell * pip_cost
-    sl_sell = current_price + sl_multiplier * ideal_drawdown_pips_sell * pip_cost
-
-    long_signal = ideal_profit_pips_buy >= profit_threshold
-    short_signal = ideal_profit_pips_sell >= profit_threshold
-
-    if long_signal and (rr_buy >= rr_sell):
+    if side == _SIDE_BUY:
         signal = 'buy'
-        chosen_tp = tp_buy
-        chosen_sl = sl_buy
-        chosen_rr = rr_buy
-    elif short_signal and (rr_sell > rr_buy):
+    elif side == _SIDE_SELL:
         signal = 'sell'
-        chosen_tp = tp_sell
-        chosen_sl = sl_sell
-        chosen_rr = rr_sell
     else:
         return {"action": "hold", "reason": "no signal meets threshold", "tp": 0, "sl": 0, "volume": 0}
 
@@ -107,7 +144,7 @@ def compute_signal(
         "volume": volume,
         "rr": chosen_rr,
         "entry_price": current_price,
-        "reason": f"{signal} signal: profit_pips={'%.1f' % (ideal_profit_pips_buy if signal=='buy' else ideal_profit_pips_sell)}, RR={'%.2f' % chosen_rr}",
+        "reason": f"{signal} signal: profit_pips={'%.1f' % profit_pips}, RR={'%.2f' % chosen_rr}",
     }
 
 
@@ -5,10 +5,17 @@ Provides ideal (perfect) predictions by looking ahead in CSV data.
 Returns predictions as returns (future_close - current_close) / current_close.
 """
 
+import functools
+import os
+import tempfile
+
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
 
+from app.utils.csv_reader import read_csv
+
 
 # Map horizon strings to number of periods (assuming hourly data)
 _HORIZON_MAP = {
@@ -21,6 +28,76 @@ _HORIZON_MAP = {
 }
 
 
+def _is_fresh(path: str, source_mtime: float) -> bool:
+    """True if *path* exists and is not older than its source file."""
+    try:
+        return os.path.getmtime(path) >= source_mtime
+    except OSError:
+        return False
+
+
+def _parse_csv(csv_file: str, datetime_column: str) -> pd.DataFrame:
+    """Read *csv_file* into a frame indexed and sorted by *datetime_column*."""
+    df = read_csv(csv_file)
+    df[datetime_column] = pd.to_datetime(df[datetime_column])
+    df.set_index(datetime_column, inplace=True)
+    df.sort_index(inplace=True)
+    return df
+
+
+def _replace_atomically(path: str, write) -> None:
+    """Call ``write(f)`` on a temp file next to *path*, then move it into place."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)),
+                                    prefix=os.path.basename(path) + ".")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def write_sidecars(csv_file: str, datetime_column: str = "DATE_TIME",
+                   close_column: str = "CLOSE") -> None:
+    """
+    Write the binary sidecars CSVPredictor reuses instead of parsing the CSV:
+    ``<csv>.parquet`` (the indexed, sorted frame; needs a parquet engine) and
+    ``<csv>.<close_column>.npy`` (the close column). Each file is moved into
+    place with os.replace, so concurrent loaders never read a partial file.
+    """
+    df = _parse_csv(csv_file, datetime_column)
+    close_values = df[close_column].to_numpy(dtype=np.float64)
+    _replace_atomically(f"{csv_file}.parquet", df.to_parquet)
+    _replace_atomically(f"{csv_file}.{close_column}.npy",
+                        lambda f: np.save(f, close_values))
+
+
+def _nearest_idx(ix_i8: np.ndarray, ts: datetime) -> int:
+    """
+    Position in the sorted int64-ns index *ix_i8* nearest to *ts*.
+
+    Matches ``Index.get_indexer([ts], method="nearest")``: ties go to the
+    later entry.
+    """
+    t = pd.Timestamp(ts).value
+    i = int(np.searchsorted(ix_i8, t))
+    if i == 0:
+        return 0
+    if i == len(ix_i8):
+        return i - 1
+    return i if ix_i8[i] - t <= t - ix_i8[i - 1] else i - 1
+
+
+def _nearest_positions(ix_i8: np.ndarray, targets_i8: np.ndarray) -> np.ndarray:
+    """Vectorized :func:`_nearest_idx` for an int64-ns array of targets."""
+    if len(ix_i8) == 1:
+        return np.zeros(len(targets_i8), dtype=np.intp)
+    i = np.clip(np.searchsorted(ix_i8, targets_i8), 1, len(ix_i8) - 1)
+    later_is_nearer = ix_i8[i] - targets_i8 <= targets_i8 - ix_i8[i - 1]
+    return np.where(later_is_nearer, i, i - 1)
+
+
 class CSVPredictor:
     """
     Ideal predictor that looks ahead in CSV data to produce perfect predictions.
@@ -48,6 +125,8 @@ class CSVPredictor:
         self.prediction_horizons = horizons
 
         self.data: Optional[pd.DataFrame] = None
+        self._close_values: Optional[np.ndarray] = None
+        self._iso_cache: Optional[np.ndarray] = None
         self._load_data(csv_file)
 
     # ------------------------------------------------------------------
@@ -55,67 +134,115 @@ class CSVPredictor:
     # ------------------------------------------------------------------
 
     def _load_data(self, csv_file: str):
-        import os
         if not os.path.exists(csv_file):
             raise FileNotFoundError(f"CSV file not found: {csv_file}")
 
-        df = pd.read_csv(csv_file)
-        df[self.datetime_column] = pd.to_datetime(df[self.datetime_column])
-        df.set_index(self.datetime_column, inplace=True)
-        df.sort_index(inplace=True)
+        # Binary sidecars written by write_sidecars() are reused while they
+        # are at least as new as the CSV; loading never creates them.
+        csv_mtime = os.path.getmtime(csv_file)
+        parquet_file = f"{csv_file}.parquet"
+        close_file = f"{csv_file}.{self.close_column}.npy"
+
+        df = None
+        if _is_fresh(parquet_file, csv_mtime):
+            try:
+                df = pd.read_parquet(parquet_file)
+            except (ImportError, OSError, ValueError):
+                df = None
+            if df is not None and df.index.name != self.datetime_column:
+                df = None
+        if df is None:
+            df = _parse_csv(csv_file, self.datetime_column)
         self.data = df
 
+        close_values = None
+        if _is_fresh(close_file, csv_mtime):
+            try:
+                close_values = np.load(close_file, mmap_mode="r")
+            except (OSError, ValueError):
+                close_values = None
+            if close_values is not None and len(close_values) != len(df):
+                close_values = None
+        if close_values is None:
+            close_values = df[self.close_column].to_numpy(dtype=np.float64)
+        self._close_values = close_values
+        # Index isoformat strings, filled lazily by _isoformat()
+        self._iso_cache = np.empty(len(df), dtype=object)
+
+    @functools.cached_property
+    def _index_i8(self) -> np.ndarray:
+        """The datetime index as sorted int64 nanoseconds, for searchsorted."""
+        return self.data.index.values.astype("datetime64[ns]").view("i8")
+
     def _get_full_data(self) -> pd.DataFrame:
         """Return full loaded data (used by tests)."""
         return self.data
 
+    def _isoformat(self, idx: int) -> str:
+        iso = self._iso_cache[idx]
+        if iso is None:
+            iso = self.data.index[idx].isoformat()
+            self._iso_cache[idx] = iso
+        return iso
+
     def _horizon_to_periods(self, horizon: str) -> int:
         if horizon in _HORIZON_MAP:
             return _HORIZON_MAP[horizon]
         raise ValueError(f"Unknown horizon: {horizon}")
 
-    # ------------------------------------------------------------------
-    # Public API
-    # ------------------------------------------------------------------
-
-    def predict(self, timestamp: datetime, symbol: str = None) -> Dict[str, Any]:
-        """
-        Generate ideal predictions at *timestamp* for each configured horizon.
-
-        Returns a dict with key ``predictions`` containing a list of dicts,
-        each with: horizon, prediction (return), timestamp, future_timestamp,
-        current_close, future_close.
-        """
-        ts = pd.Timestamp(timestamp)
-        idx = self.data.index.get_indexer([ts], method="nearest")[0]
-        current_close = self.data.iloc[idx][self.close_column]
-        current_ts = self.data.index[idx]
+    def _predict_at(self, idx: int) -> Dict[str, Any]:
+        current_close = self._close_values[idx]
+        current_iso = self._isoformat(idx)
 
         predictions: List[Dict[str, Any]] = []
         for h in self.prediction_horizons:
             periods = self._horizon_to_periods(h)
             future_idx = idx + periods
             if future_idx < len(self.data):
-                future_close = self.data.iloc[future_idx][self.close_column]
-                future_ts = self.data.index[future_idx]
+                future_close = self._close_values[future_idx]
                 predicted_return = (future_close - current_close) / current_close
                 predictions.append({
                     "horizon": h,
                     "prediction": predicted_return,
-                    "timestamp": current_ts.isoformat(),
-                    "future_timestamp": future_ts.isoformat(),
+                    "timestamp": current_iso,
+                    "future_timestamp": self._isoformat(future_idx),
                     "current_close": float(current_close),
                     "future_close": float(future_close),
                 })
 
         return {"predictions": predictions, "status": "success"}
 
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def predict(self, timestamp: datetime, symbol: str = None) -> Dict[str, Any]:
+        """
+        Generate ideal predictions at *timestamp* for each configured horizon.
+
+        Returns a dict with key ``predictions`` containing a list of dicts,
+        each with: horizon, prediction (return), timestamp, future_timestamp,
+        current_close, future_close.
+        """
+        return self._predict_at(_nearest_idx(self._index_i8, timestamp))
+
+    def predict_batch(self, timestamps: List[datetime], symbol: str = None) -> List[Dict[str, Any]]:
+        """
+        Generate predictions for several timestamps with one vectorized lookup.
+
+        Returns one ``predict``-shaped result per timestamp, in order.
+        """
+        if len(timestamps) == 0:
+            return []
+        targets = pd.DatetimeIndex(timestamps).values.astype("datetime64[ns]").view("i8")
+        positions = _nearest_positions(self._index_i8, targets)
+        return [self._predict_at(idx) for idx in positions]
+
     def validate_prediction_capability(self, timestamp: datetime) -> Dict[str, bool]:
         """
         Check which horizons can be predicted at *timestamp*.
         """
-        ts = pd.Timestamp(timestamp)
-        idx = self.data.index.get_indexer([ts], method="nearest")[0]
+        idx = _nearest_idx(self._index_i8, timestamp)
         result: Dict[str, bool] = {}
         for h in self.prediction_horizons:
             periods = self._horizon_to_periods(h)
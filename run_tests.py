@@ -57,7 +57,7 @@ def run_tests(test_level=None, verbose=False, coverage=False, parallel=False):
     
     # Add parallel execution
     if parallel:
-        cmd.extend(["-n", "auto"])
+        cmd.extend(["-n", "auto", "--dist=loadfile"])
     
     # Add additional pytest flags
     cmd.extend([
@@ -1,9 +1,17 @@
 from setuptools import setup, find_packages
 
+# Optional compiled strategy kernel; plugins fall back to pure Python without it
+try:
+    from Cython.Build import cythonize
+    ext_modules = cythonize(['plugins_strategy/_signal.pyx'], quiet=True)
+except ImportError:
+    ext_modules = []
+
 setup(
     name='lts',
     version='0.1.0',
     packages=find_packages(),
+    ext_modules=ext_modules,
     entry_points={
         'console_scripts': [
             'lts=app.main:main',
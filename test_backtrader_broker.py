@@ -2,6 +2,8 @@
 
 import sys
 import os
+import types
+from contextlib import ExitStack
 from datetime import datetime
 from unittest.mock import Mock, patch
 
@@ -13,6 +15,9 @@ sys.path.insert(0, lts_path)
 pp_path = '/home/harveybc/Documents/GitHub/prediction_provider'
 sys.path.insert(0, pp_path)
 
+# Full tracebacks on failure only when LTS_TEST_VERBOSE=1
+VERBOSE = os.environ.get("LTS_TEST_VERBOSE") == "1"
+
 try:
     print("Testing Backtrader Broker Plugin...")
     
@@ -29,6 +34,10 @@ try:
         'prediction_horizons': ['1h', '1d']
     }
     
+    # Read-only source-switch updates, built once
+    API_CFG = types.MappingProxyType({'api_url': 'http://localhost:8001'})
+    CSV_CFG = types.MappingProxyType({'csv_file': config['csv_file']})
+    
     print("Creating backtrader broker...")
     with patch('plugins_broker.backtrader_broker.BacktraderBroker._init_csv_predictor'):
         broker = BacktraderBroker(config)
@@ -38,21 +47,22 @@ try:
     print(f"✓ Initial cash: {broker.config['initial_cash']}")
     
     # Test broker info
-    with patch.object(broker, 'getcash', return_value=9500.0):
-        with patch.object(broker, 'getvalue', return_value=10200.0):
-            with patch.object(broker, 'positions', [Mock(size=100), Mock(size=0)]):
-                info = broker.get_broker_info()
-                print("✓ Broker info retrieved")
-                print(f"  - Broker type: {info.get('broker_type', 'N/A')}")
-                print(f"  - Current cash: {info.get('current_cash', 'N/A')}")
-                print(f"  - Current value: {info.get('current_value', 'N/A')}")
+    with ExitStack() as stack:
+        stack.enter_context(patch.object(broker, 'getcash', return_value=9500.0))
+        stack.enter_context(patch.object(broker, 'getvalue', return_value=10200.0))
+        stack.enter_context(patch.object(broker, 'positions', [Mock(size=100), Mock(size=0)]))
+        info = broker.get_broker_info()
+        print("✓ Broker info retrieved")
+        print(f"  - Broker type: {info.get('broker_type', 'N/A')}")
+        print(f"  - Current cash: {info.get('current_cash', 'N/A')}")
+        print(f"  - Current value: {info.get('current_value', 'N/A')}")
     
     # Test prediction source switching
     print("\nTesting prediction source switching...")
-    broker.switch_prediction_source('api', {'api_url': 'http://localhost:8001'})
+    broker.switch_prediction_source('api', API_CFG)
     print(f"✓ Switched to API source: {broker.prediction_source}")
     
-    broker.switch_prediction_source('csv', {'csv_file': config['csv_file']})
+    broker.switch_prediction_source('csv', CSV_CFG)
     print(f"✓ Switched back to CSV source: {broker.prediction_source}")
     
     # Test performance metrics (empty state)
@@ -63,6 +73,8 @@ try:
     print("\nAll tests passed!")
     
 except Exception as e:
-    print(f"✗ Error: {e}")
-    import traceback
-    traceback.print_exc()
+    print(f"✗ Error: {type(e).__name__}: {e}")
+    if VERBOSE:
+        import traceback
+        traceback.print_exc()
+    sys.exit(1)
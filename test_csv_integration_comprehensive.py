@@ -14,9 +14,9 @@ for CSV-based backtesting workflows.
 
 import sys
 import os
+import functools
 from datetime import datetime, timedelta
-import pandas as pd
-import numpy as np
+import pytest
 
 # Add paths for both repos
 prediction_provider_path = '/home/harveybc/Documents/GitHub/prediction_provider'
@@ -25,19 +25,59 @@ lts_path = '/home/harveybc/Documents/GitHub/lts'
 sys.path.insert(0, prediction_provider_path)
 sys.path.insert(0, lts_path)
 
-def test_csv_feeder_integration():
-    """Test CSV feeder functionality."""
-    print("=== Testing CSV Feeder ===")
-    
+CSV_FILE = os.path.join(prediction_provider_path, 'examples/data/phase_3/base_d6.csv')
+
+# Hourly rows between a prediction and its target, per horizon
+_OFFSETS = {'1h': 1, '6h': 6, '1d': 24}
+
+
+# The feeder and predictor each parse base_d6.csv on construction, so build
+# one instance per configuration and share it across the tests in this module.
+@functools.lru_cache(maxsize=None)
+def _shared_feeder(horizon_periods=168):  # default: 1 week of hourly data
     from feeder_plugins.csv_feeder import CSVFeeder
-    
-    config = {
-        'csv_file': os.path.join(prediction_provider_path, 'examples/data/phase_3/base_d6.csv'),
+    return CSVFeeder({
+        'csv_file': CSV_FILE,
         'datetime_column': 'DATE_TIME',
-        'horizon_periods': 168  # 1 week of hourly data
-    }
+        'horizon_periods': horizon_periods
+    })
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_predictor(prediction_horizons=('1h', '6h', '1d')):
+    from predictor_plugins.csv_predictor import CSVPredictor
+    return CSVPredictor({
+        'csv_file': CSV_FILE,
+        'datetime_column': 'DATE_TIME',
+        'prediction_horizons': list(prediction_horizons)
+    })
+
+
+@pytest.fixture(scope="module")
+def csv_feeder():
+    return _shared_feeder()
+
+
+@pytest.fixture(scope="module")
+def csv_predictor():
+    return _shared_predictor()
+
+
+@pytest.fixture(scope="module")
+def workflow_feeder():
+    return _shared_feeder(horizon_periods=48)
+
+
+@pytest.fixture(scope="module")
+def workflow_predictor():
+    return _shared_predictor(prediction_horizons=('1h',))
+
+
+def test_csv_feeder_integration(csv_feeder):
+    """Test CSV feeder functionality."""
+    print("=== Testing CSV Feeder ===")
     
-    feeder = CSVFeeder(config)
+    feeder = csv_feeder
     
     # Validate data loading
     assert feeder.data_loaded, "Data should be loaded"
@@ -58,19 +98,11 @@ def test_csv_feeder_integration():
     
     print("✓ CSV Feeder integration test passed")
 
-def test_csv_predictor_integration():
+def test_csv_predictor_integration(csv_predictor):
     """Test CSV predictor functionality."""
     print("\n=== Testing CSV Predictor ===")
     
-    from predictor_plugins.csv_predictor import CSVPredictor
-    
-    config = {
-        'csv_file': os.path.join(prediction_provider_path, 'examples/data/phase_3/base_d6.csv'),
-        'datetime_column': 'DATE_TIME',
-        'prediction_horizons': ['1h', '6h', '1d']
-    }
-    
-    predictor = CSVPredictor(config)
+    predictor = csv_predictor
     
     # Test prediction generation
     test_timestamp = datetime(2019, 1, 15, 12, 0, 0)
@@ -84,29 +116,25 @@ def test_csv_predictor_integration():
     print(f"✓ Generated {len(predictions)} predictions")
     
     # Verify prediction structure and accuracy
+    import numpy as np
+    
     full_data = predictor._get_full_data()
+    close_values = full_data['CLOSE'].to_numpy()
     test_idx = full_data.index.get_indexer([test_timestamp], method='nearest')[0]
-    current_close = full_data.iloc[test_idx]['CLOSE']
+    current_close = close_values[test_idx]
     
-    for pred in predictions:
-        horizon = pred['horizon']
-        prediction = pred['prediction']
-        
-        # Verify prediction calculation
-        if horizon == '1h':
-            future_idx = test_idx + 1
-        elif horizon == '6h':
-            future_idx = test_idx + 6
-        elif horizon == '1d':
-            future_idx = test_idx + 24
-        
-        if future_idx < len(full_data):
-            future_close = full_data.iloc[future_idx]['CLOSE']
-            expected_return = (future_close - current_close) / current_close
-            
-            # Verify accuracy (should be exact for CSV predictor)
-            assert abs(prediction - expected_return) < 1e-10, f"Prediction should be exact for {horizon}"
-            print(f"  ✓ {horizon} prediction: {prediction:.6f} (verified)")
+    # Expected returns for every horizon in one vectorized pass
+    offsets = np.fromiter((_OFFSETS[p['horizon']] for p in predictions), dtype=np.int64, count=len(predictions))
+    future_idx = test_idx + offsets
+    in_range = future_idx < len(close_values)
+    expected_returns = (close_values[future_idx[in_range]] - current_close) / current_close
+    actual_returns = np.fromiter((p['prediction'] for p in predictions), dtype=float, count=len(predictions))[in_range]
+    
+    # Verify accuracy (should be exact for CSV predictor)
+    assert np.allclose(actual_returns, expected_returns, rtol=0, atol=1e-10), "Predictions should be exact"
+    for pred, verified in zip(predictions, in_range):
+        if verified:
+            print(f"  ✓ {pred['horizon']} prediction: {pred['prediction']:.6f} (verified)")
     
     # Test batch predictions
     timestamps = [
@@ -120,42 +148,44 @@ def test_csv_predictor_integration():
     
     print("✓ CSV Predictor integration test passed")
 
-def test_prediction_based_strategy_simulation():
+def test_prediction_based_strategy_simulation(csv_predictor):
     """Test strategy simulation using CSV predictions."""
     print("\n=== Testing Strategy Simulation ===")
     
-    from predictor_plugins.csv_predictor import CSVPredictor
-    
-    config = {
-        'csv_file': os.path.join(prediction_provider_path, 'examples/data/phase_3/base_d6.csv'),
-        'datetime_column': 'DATE_TIME',
-        'prediction_horizons': ['1h', '6h', '1d']
-    }
+    import numpy as np
+    import pandas as pd
     
-    predictor = CSVPredictor(config)
+    predictor = csv_predictor
     
     # Simulate a simple prediction-based strategy
     # Strategy: Buy when 1h prediction > 0.001, Sell when < -0.001
     
-    trades = []
     portfolio_value = 10000.0
     position = 0.0
     
     # Test over a week of data
     start_date = datetime(2019, 1, 15, 0, 0, 0)
-    test_dates = [start_date + timedelta(hours=i) for i in range(0, 168, 6)]  # Every 6 hours
+    test_dates = pd.date_range(start_date, periods=28, freq='6h')  # Every 6 hours
+    
+    # P&L of each trade: at most a close and an open per step, plus the
+    # final close
+    trade_pnls = np.zeros(2 * len(test_dates) + 1)
+    total_trades = 0
     
-    for timestamp in test_dates:
+    def record_trade(pnl):
+        nonlocal total_trades
+        trade_pnls[total_trades] = pnl
+        total_trades += 1
+    
+    batch = predictor.predict_batch(test_dates)
+    
+    for timestamp, result in zip(test_dates, batch):
         try:
-            result = predictor.predict(timestamp)
-            
             if 'predictions' in result and result['predictions']:
                 # Look for 1h prediction
-                pred_1h = None
-                for pred in result['predictions']:
-                    if pred['horizon'] == '1h':
-                        pred_1h = pred['prediction']
-                        break
+                by_horizon = {p['horizon']: p for p in result['predictions']}
+                pred = by_horizon.get('1h')
+                pred_1h = pred['prediction'] if pred is not None else None
                 
                 if pred_1h is not None:
                     current_close = pred['current_close']
@@ -165,51 +195,27 @@ def test_prediction_based_strategy_simulation():
                         if position < 0:  # Close short position
                             pnl = -position * current_close - abs(position) * current_close  # Close short
                             portfolio_value += pnl
-                            trades.append({
-                                'timestamp': timestamp,
-                                'action': 'close_short',
-                                'price': current_close,
-                                'size': -position,
-                                'pnl': pnl
-                            })
+                            record_trade(pnl)
                             position = 0
                         
                         # Open long position
                         trade_size = min(1000, portfolio_value * 0.1 / current_close)  # Risk 10% of portfolio
                         position += trade_size
                         portfolio_value -= trade_size * current_close
-                        trades.append({
-                            'timestamp': timestamp,
-                            'action': 'buy',
-                            'price': current_close,
-                            'size': trade_size,
-                            'pnl': 0
-                        })
+                        record_trade(0)
                     
                     elif pred_1h < -0.001 and position >= 0:  # Strong negative prediction, go short
                         if position > 0:  # Close long position
                             pnl = position * current_close - position * current_close  # Close long (simplified)
                             portfolio_value += position * current_close
-                            trades.append({
-                                'timestamp': timestamp,
-                                'action': 'close_long',
-                                'price': current_close,
-                                'size': position,
-                                'pnl': pnl
-                            })
+                            record_trade(pnl)
                             position = 0
                         
                         # Open short position (simplified)
                         trade_size = min(1000, portfolio_value * 0.1 / current_close)
                         position -= trade_size
                         portfolio_value += trade_size * current_close  # Get cash from short
-                        trades.append({
-                            'timestamp': timestamp,
-                            'action': 'sell',
-                            'price': current_close,
-                            'size': trade_size,
-                            'pnl': 0
-                        })
+                        record_trade(0)
         
         except Exception as e:
             # Some predictions may fail due to insufficient future data
@@ -228,20 +234,14 @@ def test_prediction_based_strategy_simulation():
                 else:
                     portfolio_value -= abs(position) * final_close
                 
-                trades.append({
-                    'timestamp': final_timestamp,
-                    'action': 'close_final',
-                    'price': final_close,
-                    'size': abs(position),
-                    'pnl': 0
-                })
+                record_trade(0)
         except:
             pass
     
     # Calculate performance metrics
-    total_trades = len(trades)
-    winning_trades = len([t for t in trades if t.get('pnl', 0) > 0])
-    losing_trades = len([t for t in trades if t.get('pnl', 0) < 0])
+    pnls = trade_pnls[:total_trades]
+    winning_trades = int((pnls > 0).sum())
+    losing_trades = int((pnls < 0).sum())
     
     total_return = (portfolio_value - 10000.0) / 10000.0
     
@@ -258,27 +258,13 @@ def test_prediction_based_strategy_simulation():
     
     print("✓ Strategy simulation test passed")
 
-def test_workflow_integration():
+def test_workflow_integration(workflow_feeder, workflow_predictor):
     """Test complete CSV workflow integration."""
     print("\n=== Testing Complete Workflow Integration ===")
     
     # Test that feeder and predictor use the same underlying data
-    from feeder_plugins.csv_feeder import CSVFeeder
-    from predictor_plugins.csv_predictor import CSVPredictor
-    
-    csv_file = os.path.join(prediction_provider_path, 'examples/data/phase_3/base_d6.csv')
-    
-    feeder = CSVFeeder({
-        'csv_file': csv_file,
-        'datetime_column': 'DATE_TIME',
-        'horizon_periods': 48
-    })
-    
-    predictor = CSVPredictor({
-        'csv_file': csv_file,
-        'datetime_column': 'DATE_TIME',
-        'prediction_horizons': ['1h']
-    })
+    feeder = workflow_feeder
+    predictor = workflow_predictor
     
     # Test consistency between feeder and predictor
     test_timestamp = datetime(2019, 2, 1, 12, 0, 0)
@@ -308,15 +294,21 @@ def main():
     print("=" * 60)
     
     try:
+        feeder = _shared_feeder()
+        predictor = _shared_predictor()
+        
         # Test individual components
-        feeder = test_csv_feeder_integration()
-        predictor = test_csv_predictor_integration(feeder)
+        test_csv_feeder_integration(feeder)
+        test_csv_predictor_integration(predictor)
         
         # Test strategy simulation
         trades, final_value = test_prediction_based_strategy_simulation(predictor)
         
         # Test workflow integration
-        test_workflow_integration()
+        test_workflow_integration(
+            _shared_feeder(horizon_periods=48),
+            _shared_predictor(prediction_horizons=('1h',))
+        )
         
         print("\n" + "=" * 60)
         print("🎉 ALL INTEGRATION TESTS PASSED! 🎉")
@@ -7,14 +7,25 @@ using both CSV test mode and live API mode.
 """
 
 import asyncio
+import functools
+import signal
 import subprocess
 import sys
-import time
 import os
+import tempfile
+import types
 import json
 import logging
+from contextlib import asynccontextmanager
 from pathlib import Path
 
+import httpx
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add LTS app to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'app')))
 
@@ -25,19 +36,104 @@ from app.prediction_client import PredictionProviderClient
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+PREDICTION_PROVIDER_URL = 'http://localhost:8000'
+# Upper bound on how long the provider may take to answer /health
+STARTUP_TIMEOUT = 10.0
+# Grace period after terminate() before the provider is killed
+SHUTDOWN_TIMEOUT = 5.0
+# Provider stdout+stderr go to this file rather than pipes nobody drains,
+# so a chatty provider can never block on a full pipe buffer
+PROVIDER_LOG = Path(tempfile.gettempdir()) / "prediction_provider.log"
+# How much of the provider log to include in failure messages
+OUTPUT_TAIL_BYTES = 4096
+# Prediction time requested in both modes
+TEST_DATETIME = "2023-01-15T10:00:00"
+# Pool limits for the client shared by the readiness probe and both modes
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+
+# Per-mode client configs, built once; the client only reads them
+_CSV_CONFIG = types.MappingProxyType({
+    **DEFAULT_VALUES,
+    'csv_test_mode': True,
+    'csv_test_data_path': '../prediction_provider/examples/data/phase_3/base_d1.csv',
+    'csv_test_lookahead': True,
+    'prediction_provider_url': PREDICTION_PROVIDER_URL,
+    'short_term_model': {
+        'predictor_plugin': 'transformer_predictor',
+        'interval': '1h',
+        'prediction_horizon': 6,
+        'lookback_ticks': 1000
+    },
+    'long_term_model': {
+        'predictor_plugin': 'cnn_predictor',
+        'interval': '1d',
+        'prediction_horizon': 6,
+        'lookback_ticks': 1000
+    }
+})
+_API_CONFIG = types.MappingProxyType({
+    **DEFAULT_VALUES,
+    'csv_test_mode': False,
+    'prediction_provider_url': PREDICTION_PROVIDER_URL,
+    'prediction_provider_timeout': 120,
+    'prediction_provider_retries': 3,
+    'short_term_model': {
+        'predictor_plugin': 'default_predictor',
+        'feeder_plugin': 'default_feeder',
+        'pipeline_plugin': 'default_pipeline',
+        'interval': '1h',
+        'prediction_horizon': 6
+    },
+    'long_term_model': {
+        'predictor_plugin': 'default_predictor',
+        'feeder_plugin': 'default_feeder',
+        'pipeline_plugin': 'default_pipeline',
+        'interval': '1d',
+        'prediction_horizon': 6
+    }
+})
+_MODE_CONFIGS = {'csv_mode': _CSV_CONFIG, 'api_mode': _API_CONFIG}
+
 class LiveAPIIntegrationTest:
     """Test the complete LTS + Prediction Provider integration."""
     
     def __init__(self):
         self.prediction_provider_process = None
+        self._client = None
+        self._prediction_clients = {}
         self.test_results = {
             'csv_mode': {},
             'api_mode': {},
             'comparison': {}
         }
     
-    def start_prediction_provider(self):
-        """Start the prediction provider service in the background."""
+    async def __aenter__(self):
+        # One connection pool for /health, /predict and /predictions/{id}
+        self._client = httpx.AsyncClient(timeout=30, limits=HTTP_LIMITS)
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._client.aclose()
+        self._client = None
+        self._prediction_clients.clear()
+    
+    def _prediction_client(self, mode):
+        """The PredictionProviderClient for *mode*, built on first use and then reused."""
+        client = self._prediction_clients.get(mode)
+        if client is None:
+            client = PredictionProviderClient(_MODE_CONFIGS[mode], client=self._client)
+            self._prediction_clients[mode] = client
+        return client
+    
+    @asynccontextmanager
+    async def provider_context(self):
+        """
+        Run the prediction provider service for the duration of the block.
+        
+        Yields True once the service answers /health, False if it could not be
+        started. The process is terminated on exit, including on errors and
+        cancellation.
+        """
         logger.info("Starting prediction provider service...")
         
         # Change to prediction provider directory
@@ -45,145 +141,161 @@ class LiveAPIIntegrationTest:
         if not pp_dir.exists():
             raise FileNotFoundError(f"Prediction provider directory not found: {pp_dir}")
         
+        loop = asyncio.get_running_loop()
+        log_file = open(PROVIDER_LOG, 'wb')
         try:
-            # Start the prediction provider
-            self.prediction_provider_process = subprocess.Popen(
+            # Start the prediction provider. Fork/exec runs on a worker thread so a
+            # slow spawn cannot stall the event loop; the new session lets _stop
+            # signal the provider's whole process group.
+            self.prediction_provider_process = await loop.run_in_executor(None, functools.partial(
+                subprocess.Popen,
                 [sys.executable, "-m", "app.main"],
                 cwd=str(pp_dir),
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-            
+                stdout=log_file,
+                stderr=subprocess.STDOUT,
+                close_fds=True,
+                start_new_session=True
+            ))
+        except Exception as e:
+            log_file.close()
+            logger.error("Failed to start prediction provider: %s", e)
+            yield False
+            return
+        
+        proc = self.prediction_provider_process
+        try:
             # Wait for service to start
             logger.info("Waiting for prediction provider to start...")
-            time.sleep(10)
-            
-            # Check if process is still running
-            if self.prediction_provider_process.poll() is None:
-                logger.info("Prediction provider started successfully")
-                return True
+            ready = await self._wait_until_ready()
+            if ready:
+                logger.info("Prediction provider started successfully (log: %s)", PROVIDER_LOG)
+            elif proc.poll() is not None:
+                logger.error("Prediction provider failed to start. Output tail: %s", self._log_tail())
             else:
-                stdout, stderr = self.prediction_provider_process.communicate()
-                logger.error(f"Prediction provider failed to start. STDOUT: {stdout.decode()}, STDERR: {stderr.decode()}")
+                logger.error("Prediction provider not ready after %ss. Output tail: %s", STARTUP_TIMEOUT, self._log_tail())
+            yield ready
+        finally:
+            await self._stop(proc)
+            log_file.close()
+    
+    @staticmethod
+    def _log_tail():
+        """The last OUTPUT_TAIL_BYTES of the provider log, decoded."""
+        with open(PROVIDER_LOG, 'rb') as f:
+            f.seek(max(f.seek(0, os.SEEK_END) - OUTPUT_TAIL_BYTES, 0))
+            return f.read().decode(errors='replace')
+    
+    async def _wait_until_ready(self) -> bool:
+        """Poll /health with exponential backoff until it returns 200 or STARTUP_TIMEOUT passes."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + STARTUP_TIMEOUT
+        delay = 0.05
+        while loop.time() < deadline:
+            if self.prediction_provider_process.poll() is not None:
                 return False
-                
-        except Exception as e:
-            logger.error(f"Failed to start prediction provider: {e}")
-            return False
+            try:
+                response = await self._client.get(f"{PREDICTION_PROVIDER_URL}/health", timeout=1.0)
+                if response.status_code == 200:
+                    return True
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 1.0)
+        return False
     
-    def stop_prediction_provider(self):
-        """Stop the prediction provider service."""
-        if self.prediction_provider_process:
+    async def _stop(self, proc):
+        """Terminate the provider's process group, killing it if it outlives SHUTDOWN_TIMEOUT."""
+        if proc.poll() is None:
             logger.info("Stopping prediction provider service...")
-            self.prediction_provider_process.terminate()
-            self.prediction_provider_process.wait()
+            loop = asyncio.get_running_loop()
+            self._signal_group(proc, signal.SIGTERM)
+            try:
+                await loop.run_in_executor(None, functools.partial(proc.wait, timeout=SHUTDOWN_TIMEOUT))
+            except subprocess.TimeoutExpired:
+                self._signal_group(proc, signal.SIGKILL)
+                await loop.run_in_executor(None, proc.wait)
             logger.info("Prediction provider stopped")
+        self.prediction_provider_process = None
+    
+    @staticmethod
+    def _signal_group(proc, sig):
+        try:
+            os.killpg(proc.pid, sig)
+        except ProcessLookupError:
+            pass  # already gone
     
     async def test_csv_mode(self):
-        """Test LTS with CSV test mode."""
+        """Test LTS with CSV test mode; returns the result entry for test_results."""
         logger.info("=== Testing CSV Mode ===")
         
         try:
-            # Configuration for CSV mode
-            config = DEFAULT_VALUES.copy()
-            config.update({
-                'csv_test_mode': True,
-                'csv_test_data_path': '../prediction_provider/examples/data/phase_3/base_d1.csv',
-                'csv_test_lookahead': True,
-                'prediction_provider_url': 'http://localhost:8000',
-                'short_term_model': {
-                    'predictor_plugin': 'transformer_predictor',
-                    'interval': '1h',
-                    'prediction_horizon': 6,
-                    'lookback_ticks': 1000
-                },
-                'long_term_model': {
-                    'predictor_plugin': 'cnn_predictor',
-                    'interval': '1d',
-                    'prediction_horizon': 6,
-                    'lookback_ticks': 1000
-                }
-            })
-            
-            # Create prediction client
-            client = PredictionProviderClient(config)
+            client = self._prediction_client('csv_mode')
             
             # Test prediction request
-            test_datetime = "2023-01-15T10:00:00"
+            test_datetime = TEST_DATETIME
             predictions = await client.get_predictions(
                 symbol="EURUSD",
                 datetime_str=test_datetime,
                 prediction_types=['short_term', 'long_term']
             )
             
-            self.test_results['csv_mode'] = {
+            result = {
                 'status': 'success',
                 'predictions': predictions,
                 'test_datetime': test_datetime
             }
             
-            logger.info(f"CSV mode test successful:")
-            logger.info(f"  Short-term predictions: {len(predictions['predictions'].get('short_term', []))}")
-            logger.info(f"  Long-term predictions: {len(predictions['predictions'].get('long_term', []))}")
-            logger.info(f"  Historical context: {predictions.get('historical_context', {}).get('count', 0)} ticks")
+            logger.info("CSV mode test successful:")
+            logger.info("  Short-term predictions: %d", len(predictions['predictions'].get('short_term', [])))
+            logger.info("  Long-term predictions: %d", len(predictions['predictions'].get('long_term', [])))
+            logger.info("  Historical context: %s ticks", predictions.get('historical_context', {}).get('count', 0))
+            return result
             
         except Exception as e:
-            logger.error(f"CSV mode test failed: {e}")
-            self.test_results['csv_mode'] = {'status': 'failed', 'error': str(e)}
+            logger.error("CSV mode test failed: %s", e)
+            return {'status': 'failed', 'error': str(e)}
     
     async def test_api_mode(self):
-        """Test LTS with live API mode."""
+        """Test LTS with live API mode; returns the result entry for test_results."""
         logger.info("=== Testing Live API Mode ===")
         
         try:
-            # Configuration for API mode
-            config = DEFAULT_VALUES.copy()
-            config.update({
-                'csv_test_mode': False,
-                'prediction_provider_url': 'http://localhost:8000',
-                'prediction_provider_timeout': 120,
-                'prediction_provider_retries': 3,
-                'short_term_model': {
-                    'predictor_plugin': 'default_predictor',
-                    'feeder_plugin': 'default_feeder',
-                    'pipeline_plugin': 'default_pipeline',
-                    'interval': '1h',
-                    'prediction_horizon': 6
-                },
-                'long_term_model': {
-                    'predictor_plugin': 'default_predictor',
-                    'feeder_plugin': 'default_feeder',
-                    'pipeline_plugin': 'default_pipeline',
-                    'interval': '1d',
-                    'prediction_horizon': 6
-                }
-            })
-            
-            # Create prediction client
-            client = PredictionProviderClient(config)
+            client = self._prediction_client('api_mode')
             
             # Test prediction request
-            test_datetime = "2023-01-15T10:00:00"
+            test_datetime = TEST_DATETIME
             predictions = await client.get_predictions(
                 symbol="EURUSD",
                 datetime_str=test_datetime,
                 prediction_types=['short_term', 'long_term']
             )
             
-            self.test_results['api_mode'] = {
+            result = {
                 'status': 'success',
                 'predictions': predictions,
                 'test_datetime': test_datetime
             }
             
-            logger.info(f"API mode test successful:")
-            logger.info(f"  Short-term predictions: {len(predictions['predictions'].get('short_term', []))}")
-            logger.info(f"  Long-term predictions: {len(predictions['predictions'].get('long_term', []))}")
-            logger.info(f"  Response source: {predictions.get('source', 'unknown')}")
+            logger.info("API mode test successful:")
+            logger.info("  Short-term predictions: %d", len(predictions['predictions'].get('short_term', [])))
+            logger.info("  Long-term predictions: %d", len(predictions['predictions'].get('long_term', [])))
+            logger.info("  Response source: %s", predictions.get('source', 'unknown'))
+            return result
             
         except Exception as e:
-            logger.error(f"API mode test failed: {e}")
-            self.test_results['api_mode'] = {'status': 'failed', 'error': str(e)}
+            logger.error("API mode test failed: %s", e)
+            return {'status': 'failed', 'error': str(e)}
+    
+    async def run_api_mode(self):
+        """Run the API mode test against a freshly started prediction provider."""
+        async with self.provider_context() as provider_ready:
+            if provider_ready:
+                return await self.test_api_mode()
+            logger.error("Could not start prediction provider - skipping API tests")
+            return {
+                'status': 'failed', 
+                'error': 'Could not start prediction provider service'
+            }
     
     def compare_results(self):
         """Compare CSV and API mode results."""
@@ -213,36 +325,45 @@ class LiveAPIIntegrationTest:
         
         self.test_results['comparison'] = comparison
         
-        logger.info(f"Comparison results:")
-        logger.info(f"  CSV mode successful: {csv_success}")
-        logger.info(f"  API mode successful: {api_success}")
-        logger.info(f"  Both modes successful: {comparison['both_successful']}")
+        logger.info("Comparison results:")
+        logger.info("  CSV mode successful: %s", csv_success)
+        logger.info("  API mode successful: %s", api_success)
+        logger.info("  Both modes successful: %s", comparison['both_successful'])
     
     def save_results(self):
         """Save test results to file."""
         results_file = "live_api_integration_results.json"
-        with open(results_file, 'w') as f:
-            json.dump(self.test_results, f, indent=2, default=str)
-        logger.info(f"Test results saved to {results_file}")
+        if orjson is not None:
+            # Datetimes go through default=str as with json.dumps; numpy
+            # scalars and arrays are written as JSON numbers and lists
+            # rather than their str() form
+            data = orjson.dumps(
+                self.test_results,
+                default=str,
+                option=(orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+                        | orjson.OPT_PASSTHROUGH_DATETIME)
+            )
+            Path(results_file).write_bytes(data)
+        else:
+            with open(results_file, 'w') as f:
+                json.dump(self.test_results, f, indent=2, default=str)
+        logger.info("Test results saved to %s", results_file)
     
     async def run_all_tests(self):
         """Run all integration tests."""
         logger.info("Starting Live API Integration Tests")
         
         try:
-            # Test CSV mode first (doesn't require prediction provider)
-            await self.test_csv_mode()
-            
-            # Start prediction provider for API tests
-            if self.start_prediction_provider():
-                # Test API mode
-                await self.test_api_mode()
-            else:
-                logger.error("Could not start prediction provider - skipping API tests")
-                self.test_results['api_mode'] = {
-                    'status': 'failed', 
-                    'error': 'Could not start prediction provider service'
-                }
+            # CSV mode needs no provider, so it runs while the provider boots
+            # and serves the API mode test
+            results = await asyncio.gather(
+                self.test_csv_mode(), self.run_api_mode(), return_exceptions=True
+            )
+            for mode, result in zip(('csv_mode', 'api_mode'), results):
+                if isinstance(result, BaseException):
+                    logger.error("%s crashed: %s", mode, result)
+                    result = {'status': 'failed', 'error': str(result)}
+                self.test_results[mode] = result
             
             # Compare results
             self.compare_results()
@@ -251,15 +372,12 @@ class LiveAPIIntegrationTest:
             self.save_results()
             
         except Exception as e:
-            logger.error(f"Test execution failed: {e}")
-        finally:
-            # Clean up
-            self.stop_prediction_provider()
+            logger.error("Test execution failed: %s", e)
 
 async def main():
     """Main test execution."""
-    test = LiveAPIIntegrationTest()
-    await test.run_all_tests()
+    async with LiveAPIIntegrationTest() as test:
+        await test.run_all_tests()
     
     # Print summary
     logger.info("=== Test Summary ===")
@@ -4,32 +4,130 @@ Test LTS endpoints with running prediction provider
 """
 
 import asyncio
+import io
 import json
+import logging
+import os
+import sys
 import httpx
 import time
 from datetime import datetime
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+try:
+    import h2  # noqa: F401 -- httpx negotiates HTTP/2 only when h2 is installed
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Statuses after which a prediction will not change any more
+TERMINAL_STATUSES = ('completed', 'failed')
+
+
+async def _wait_for_completion(client, base_url, prediction_id, max_wait=30):
+    """
+    Poll a prediction with exponential backoff (0.05s doubling, 1.6s cap)
+    until it reaches a terminal status or *max_wait* seconds pass.
+
+    Returns ``(result, waited)``; *result* is the last JSON body seen, or
+    None if no status request succeeded.
+    """
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    delay = 0.05
+    result = None
+    while True:
+        response = await client.get(f"{base_url}/api/v1/predictions/{prediction_id}")
+        if response.status_code == 200:
+            result = response.json()
+            if result.get('status') in TERMINAL_STATUSES or result.get('result'):
+                break
+        waited = loop.time() - start
+        if waited >= max_wait:
+            break
+        await asyncio.sleep(min(delay, max_wait - waited))
+        delay = min(delay * 2, 1.6)
+    return result, loop.time() - start
+
+def _report_submission(out, response, label):
+    """Write the outcome of a POST /api/v1/predict to *out*; returns the prediction ID or None."""
+    if isinstance(response, Exception):
+        print(f"   ❌ {label} prediction request failed: {response}", file=out)
+        return None
+    
+    print(f"   Status: {response.status_code}", file=out)
+    if response.status_code not in [200, 201]:
+        print(f"   ❌ Failed to create {label.lower()} prediction: {response.text}", file=out)
+        return None
+    
+    result = response.json()
+    prediction_id = result.get('id')
+    print(f"   ✅ {label} prediction created with ID: {prediction_id}", file=out)
+    print(f"   Task ID: {result.get('task_id')}", file=out)
+    print(f"   Status: {result.get('status')}", file=out)
+    return prediction_id
+
+def _report_completion(out, label, prediction_id, outcome, max_wait):
+    """Write the result of _wait_for_completion for one prediction to *out*."""
+    if isinstance(outcome, Exception):
+        print(f"   ❌ {label} status check failed: {outcome}", file=out)
+        return
+    
+    status_result, waited = outcome
+    if status_result is None:
+        print(f"   ❌ Status check failed for {label.lower()} prediction {prediction_id}", file=out)
+    elif status_result.get('status') == 'failed':
+        print(f"   ❌ {label} prediction failed: {status_result.get('error', 'Unknown error')}", file=out)
+    elif status_result.get('status') == 'completed' or status_result.get('result'):
+        print(f"   ✅ {label} prediction completed after {waited:.2f}s!", file=out)
+        # The full payload is only rendered when debug logging is on
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("   Result: %s", json.dumps(status_result.get('result'), indent=2))
+    else:
+        print(f"   ⚠️ {label} prediction timed out after {max_wait}s (status: {status_result.get('status')})", file=out)
+
+def _flush(out):
+    """Write the buffered section to stdout in one call and reset the buffer."""
+    sys.stdout.write(out.getvalue())
+    sys.stdout.flush()
+    out.seek(0)
+    out.truncate()
+
 async def test_prediction_endpoints():
     """Test the specific endpoints that LTS needs."""
     
+    # Output is buffered and written once per section
+    out = io.StringIO()
     base_url = "http://127.0.0.1:8000"
     
-    print("🔍 Testing LTS Required Endpoints")
-    print("=" * 50)
+    print("🔍 Testing LTS Required Endpoints", file=out)
+    print("=" * 50, file=out)
     
-    async with httpx.AsyncClient(timeout=30) as client:
+    async with httpx.AsyncClient(
+        timeout=30,
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_keepalive_connections=10)
+    ) as client:
         
         # Test 1: Health Check
-        print("\n1. Testing Health Check...")
+        print("\n1. Testing Health Check...", file=out)
         try:
             response = await client.get(f"{base_url}/health")
-            print(f"   Status: {response.status_code}")
-            print(f"   Response: {response.text}")
+            print(f"   Status: {response.status_code}", file=out)
+            print(f"   Response: {response.text}", file=out)
         except Exception as e:
-            print(f"   ❌ Health check failed: {e}")
+            print(f"   ❌ Health check failed: {e}", file=out)
         
-        # Test 2: Short-term Prediction Request
-        print("\n2. Testing Short-term Prediction Request...")
+        _flush(out)
+        
+        # Short- and long-term requests are independent: submit both at once,
+        # then poll both at once
         short_term_data = {
             "symbol": "EURUSD",
             "prediction_type": "short_term",
@@ -39,67 +137,6 @@ async def test_prediction_endpoints():
             "interval": "1h",
             "prediction_horizon": 6
         }
-        
-        try:
-            response = await client.post(f"{base_url}/api/v1/predict", json=short_term_data)
-            print(f"   Status: {response.status_code}")
-            
-            if response.status_code in [200, 201]:
-                result = response.json()
-                prediction_id = result.get('id')
-                print(f"   ✅ Prediction created with ID: {prediction_id}")
-                print(f"   Task ID: {result.get('task_id')}")
-                print(f"   Status: {result.get('status')}")
-                
-                # Test 3: Check Prediction Status
-                print(f"\n3. Testing Prediction Status Check (ID: {prediction_id})...")
-                
-                # Wait a moment and check status
-                await asyncio.sleep(2)
-                
-                status_response = await client.get(f"{base_url}/api/v1/predictions/{prediction_id}")
-                print(f"   Status: {status_response.status_code}")
-                
-                if status_response.status_code == 200:
-                    status_result = status_response.json()
-                    print(f"   Prediction Status: {status_result.get('status')}")
-                    
-                    if status_result.get('result'):
-                        print(f"   ✅ Prediction Result Available!")
-                        print(f"   Result: {json.dumps(status_result.get('result'), indent=2)}")
-                    else:
-                        print(f"   ⏳ Prediction still processing...")
-                        
-                        # Poll for completion (up to 30 seconds)
-                        max_wait = 30
-                        wait_time = 0
-                        while wait_time < max_wait:
-                            await asyncio.sleep(2)
-                            wait_time += 2
-                            
-                            poll_response = await client.get(f"{base_url}/api/v1/predictions/{prediction_id}")
-                            if poll_response.status_code == 200:
-                                poll_result = poll_response.json()
-                                if poll_result.get('status') == 'completed':
-                                    print(f"   ✅ Prediction completed after {wait_time}s!")
-                                    print(f"   Result: {json.dumps(poll_result.get('result'), indent=2)}")
-                                    break
-                                elif poll_result.get('status') == 'failed':
-                                    print(f"   ❌ Prediction failed: {poll_result.get('error', 'Unknown error')}")
-                                    break
-                                else:
-                                    print(f"   ⏳ Still processing... ({wait_time}s)")
-                        else:
-                            print(f"   ⚠️ Prediction timed out after {max_wait}s")
-                
-            else:
-                print(f"   ❌ Failed to create prediction: {response.text}")
-                
-        except Exception as e:
-            print(f"   ❌ Prediction request failed: {e}")
-        
-        # Test 4: Long-term Prediction Request
-        print("\n4. Testing Long-term Prediction Request...")
         long_term_data = {
             "symbol": "EURUSD",
             "prediction_type": "long_term",
@@ -109,39 +146,61 @@ async def test_prediction_endpoints():
             "interval": "1d",
             "prediction_horizon": 6
         }
+        short_response, long_response = await asyncio.gather(
+            client.post(f"{base_url}/api/v1/predict", json=short_term_data),
+            client.post(f"{base_url}/api/v1/predict", json=long_term_data),
+            return_exceptions=True
+        )
         
-        try:
-            response = await client.post(f"{base_url}/api/v1/predict", json=long_term_data)
-            print(f"   Status: {response.status_code}")
-            
-            if response.status_code in [200, 201]:
-                result = response.json()
-                print(f"   ✅ Long-term prediction created with ID: {result.get('id')}")
-            else:
-                print(f"   ❌ Failed: {response.text}")
-                
-        except Exception as e:
-            print(f"   ❌ Long-term prediction failed: {e}")
+        # Test 2: Short-term Prediction Request
+        print("\n2. Testing Short-term Prediction Request...", file=out)
+        short_id = _report_submission(out, short_response, "Short-term")
+        
+        # Test 3: Long-term Prediction Request
+        print("\n3. Testing Long-term Prediction Request...", file=out)
+        long_id = _report_submission(out, long_response, "Long-term")
+        
+        _flush(out)
+        
+        # Test 4: Check Prediction Status
+        submitted = [(label, pid) for label, pid in (("Short-term", short_id), ("Long-term", long_id)) if pid is not None]
+        if submitted:
+            print(f"\n4. Testing Prediction Status Check (IDs: {', '.join(str(pid) for _, pid in submitted)})...", file=out)
+            max_wait = 30
+            outcomes = await asyncio.gather(
+                *(_wait_for_completion(client, base_url, pid, max_wait) for _, pid in submitted),
+                return_exceptions=True
+            )
+            for (label, pid), outcome in zip(submitted, outcomes):
+                _report_completion(out, label, pid, outcome, max_wait)
+        
+        _flush(out)
         
         # Test 5: List Predictions
-        print("\n5. Testing List Predictions...")
+        print("\n5. Testing List Predictions...", file=out)
         try:
             response = await client.get(f"{base_url}/api/v1/predictions/")
-            print(f"   Status: {response.status_code}")
+            print(f"   Status: {response.status_code}", file=out)
             
             if response.status_code == 200:
                 predictions = response.json()
-                print(f"   ✅ Found {len(predictions)} predictions")
+                print(f"   ✅ Found {len(predictions)} predictions", file=out)
                 for pred in predictions[-3:]:  # Show last 3
-                    print(f"      ID: {pred.get('id')}, Status: {pred.get('status')}, Symbol: {pred.get('symbol')}")
+                    print(f"      ID: {pred.get('id')}, Status: {pred.get('status')}, Symbol: {pred.get('symbol')}", file=out)
             else:
-                print(f"   ❌ Failed: {response.text}")
+                print(f"   ❌ Failed: {response.text}", file=out)
                 
         except Exception as e:
-            print(f"   ❌ List predictions failed: {e}")
+            print(f"   ❌ List predictions failed: {e}", file=out)
 
-    print("\n" + "=" * 50)
-    print("✅ LTS Endpoint Testing Complete!")
+    print("\n" + "=" * 50, file=out)
+    print("✅ LTS Endpoint Testing Complete!", file=out)
+    _flush(out)
 
 if __name__ == "__main__":
+    # LTS_TEST_VERBOSE=1 also dumps full prediction payloads
+    verbose = os.environ.get("LTS_TEST_VERBOSE") == "1"
+    logging.basicConfig(level=logging.DEBUG if verbose else logging.WARNING, format='%(message)s')
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     asyncio.run(test_prediction_endpoints())
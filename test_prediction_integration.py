@@ -7,10 +7,15 @@ including CSV test mode and strategy signal generation.
 """
 
 import asyncio
+import functools
 import json
+import logging
+import os
 import sys
+import types
 from datetime import datetime, timedelta
-from pathlib import Path
+
+import numpy as np
 
 # Add the LTS app to the Python path
 sys.path.insert(0, '/home/harveybc/Documents/GitHub/lts')
@@ -18,21 +23,40 @@ sys.path.insert(0, '/home/harveybc/Documents/GitHub/lts')
 from app.config import DEFAULT_VALUES
 from app.prediction_client import PredictionProviderClient
 
+logger = logging.getLogger(__name__)
+
+CSV_TEST_DATA_PATH = '/home/harveybc/Documents/GitHub/prediction_provider/examples/data/phase_3/base_d1.csv'
+
+# Test configs, built once; the client and strategy only read them
+_CSV_CONFIG = types.MappingProxyType({
+    **DEFAULT_VALUES,
+    'csv_test_mode': True,
+    'csv_test_data_path': CSV_TEST_DATA_PATH,
+    'csv_test_lookahead': True
+})
+_STRATEGY_CONFIG = types.MappingProxyType({
+    **_CSV_CONFIG,
+    'confidence_threshold': 0.5,
+    'uncertainty_threshold': 0.1
+})
+
+_CONFIGS = {'csv': _CSV_CONFIG}
+
+# Upper bound on the whole concurrent run, in seconds
+TEST_SUITE_TIMEOUT = 120
+
+
+@functools.lru_cache(maxsize=4)
+def _client_for(config_name):
+    """Shared PredictionProviderClient per named config, built on first use."""
+    return PredictionProviderClient(_CONFIGS[config_name])
+
 
 async def test_csv_mode():
     """Test CSV-based prediction mode"""
     print("🧪 Testing CSV Prediction Mode...")
     
-    # Configure for CSV test mode
-    config = DEFAULT_VALUES.copy()
-    config.update({
-        'csv_test_mode': True,
-        'csv_test_data_path': '/home/harveybc/Documents/GitHub/prediction_provider/examples/data/phase_3/base_d1.csv',
-        'csv_test_lookahead': True
-    })
-    
-    # Create prediction client
-    client = PredictionProviderClient(config)
+    client = _client_for('csv')
     
     # Test prediction for a specific time
     test_datetime = "2005-05-10T12:00:00"
@@ -52,12 +76,12 @@ async def test_csv_mode():
         
         # Show first few predictions
         if predictions['predictions'].get('short_term'):
-            short_preds = predictions['predictions']['short_term'][:3]
-            print(f"   First 3 short-term: {[f'{p:.5f}' for p in short_preds]}")
+            short_preds = np.asarray(predictions['predictions']['short_term'][:3], dtype=np.float64)
+            print(f"   First 3 short-term: {np.array2string(short_preds, precision=5, floatmode='fixed')}")
         
         if predictions['predictions'].get('long_term'):
-            long_preds = predictions['predictions']['long_term'][:3]
-            print(f"   First 3 long-term: {[f'{p:.5f}' for p in long_preds]}")
+            long_preds = np.asarray(predictions['predictions']['long_term'][:3], dtype=np.float64)
+            print(f"   First 3 long-term: {np.array2string(long_preds, precision=5, floatmode='fixed')}")
         
         return True
         
@@ -73,19 +97,9 @@ async def test_strategy_integration():
     try:
         from plugins_strategy.prediction_strategy import PredictionBasedStrategy
         
-        # Configure for CSV test mode
-        config = DEFAULT_VALUES.copy()
-        config.update({
-            'csv_test_mode': True,
-            'csv_test_data_path': '/home/harveybc/Documents/GitHub/prediction_provider/examples/data/phase_3/base_d1.csv',
-            'csv_test_lookahead': True,
-            'confidence_threshold': 0.5,
-            'uncertainty_threshold': 0.1
-        })
-        
         # Initialize strategy
-        strategy = PredictionBasedStrategy(config)
-        strategy.set_prediction_client_config(config)
+        strategy = PredictionBasedStrategy(_STRATEGY_CONFIG)
+        strategy.set_prediction_client_config(_STRATEGY_CONFIG)
         
         # Test signal generation
         current_price = 1.2845
@@ -118,9 +132,7 @@ async def test_strategy_integration():
         return True
         
     except Exception as e:
-        print(f"❌ Strategy integration failed: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Strategy integration failed: %s", e)
         return False
 
 
@@ -128,7 +140,7 @@ async def test_model_configurations():
     """Test model configuration setup"""
     print("\n🧪 Testing Model Configurations...")
     
-    config = DEFAULT_VALUES.copy()
+    config = DEFAULT_VALUES
     
     # Check short-term model config
     short_config = config.get('short_term_model', {})
@@ -149,28 +161,57 @@ async def test_model_configurations():
     return True
 
 
+def _csv_summary(csv_path):
+    """Row count, column names and first/last DATE_TIME of a CSV file."""
+    try:
+        import pyarrow.csv as pv
+    except ImportError:
+        import pandas as pd
+        df = pd.read_csv(csv_path)
+        return len(df), list(df.columns), df['DATE_TIME'].iloc[0], df['DATE_TIME'].iloc[-1]
+    
+    # Multithreaded columnar parse; only the two boundary dates become Python objects
+    table = pv.read_csv(csv_path, read_options=pv.ReadOptions(use_threads=True, block_size=8 << 20))
+    dates = table.column('DATE_TIME')
+    return table.num_rows, table.column_names, dates[0].as_py(), dates[-1].as_py()
+
+
 async def test_csv_data_availability():
     """Test if CSV test data is available"""
     print("\n🧪 Testing CSV Data Availability...")
     
-    csv_path = Path('/home/harveybc/Documents/GitHub/prediction_provider/examples/data/phase_3/base_d1.csv')
+    csv_path = CSV_TEST_DATA_PATH
     
-    if csv_path.exists():
-        import pandas as pd
-        try:
-            df = pd.read_csv(csv_path)
-            print(f"✅ CSV data loaded successfully")
-            print(f"   File: {csv_path}")
-            print(f"   Rows: {len(df)}")
-            print(f"   Columns: {list(df.columns)}")
-            print(f"   Date range: {df['DATE_TIME'].iloc[0]} to {df['DATE_TIME'].iloc[-1]}")
-            return True
-        except Exception as e:
-            print(f"❌ Failed to load CSV data: {e}")
-            return False
-    else:
+    # A single stat covers the existence check
+    try:
+        os.stat(csv_path)
+    except FileNotFoundError:
         print(f"❌ CSV file not found: {csv_path}")
         return False
+    except OSError as e:
+        print(f"❌ {e}")
+        return False
+    
+    try:
+        rows, columns, first_date, last_date = _csv_summary(csv_path)
+        print(f"✅ CSV data loaded successfully")
+        print(f"   File: {csv_path}")
+        print(f"   Rows: {rows}")
+        print(f"   Columns: {columns}")
+        print(f"   Date range: {first_date} to {last_date}")
+        return True
+    except Exception as e:
+        print(f"❌ Failed to load CSV data: {e}")
+        return False
+
+
+async def _guarded(test_name, coro):
+    """Await a test coroutine, reporting a crash as a failed result."""
+    try:
+        return await coro
+    except Exception as e:
+        print(f"❌ Test '{test_name}' crashed: {e}")
+        return False
 
 
 async def main():
@@ -185,14 +226,13 @@ async def main():
         ("Strategy Integration", test_strategy_integration())
     ]
     
-    results = []
-    for test_name, test_coro in tests:
-        try:
-            result = await test_coro
-            results.append((test_name, result))
-        except Exception as e:
-            print(f"❌ Test '{test_name}' crashed: {e}")
-            results.append((test_name, False))
+    # The tests share no state, so run them concurrently; _guarded keeps one
+    # crashing test from cancelling the rest of the group
+    async with asyncio.timeout(TEST_SUITE_TIMEOUT):
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(_guarded(name, coro), name=name) for name, coro in tests]
+    
+    results = [(name, task.result()) for (name, _), task in zip(tests, tasks)]
     
     # Summary
     print("\n" + "=" * 60)
@@ -222,7 +262,5 @@ if __name__ == "__main__":
         print("\n⏹️  Tests interrupted by user")
         sys.exit(1)
     except Exception as e:
-        print(f"\n💥 Test suite crashed: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("\n💥 Test suite crashed: %s", e)
         sys.exit(1)
@@ -7,222 +7,554 @@ by making HTTP requests and verifying the expected model selection behavior.
 """
 
 import asyncio
-import aiohttp
+import hashlib
+import httpx
 import json
 import sys
 import os
+import types
 from datetime import datetime
 
+try:
+    import pytest
+    import pytest_asyncio
+except ImportError:
+    # Standalone runs (python test_prediction_provider_integration.py) need
+    # only httpx; the pytest fixtures and tests below are then not defined
+    pytest = None
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import h2  # noqa: F401 -- httpx negotiates HTTP/2 only when h2 is installed
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 # Add LTS app to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'app')))
 
-async def test_prediction_provider_integration():
-    """Test the integration with prediction provider endpoints."""
-    
-    print("🧪 Testing LTS + Prediction Provider Integration")
-    print("=" * 60)
-    
-    # Test configuration
-    base_url = "http://localhost:8000"
-    test_cases = [
-        {
-            "name": "1h interval (CNN model)",
-            "payload": {
-                "symbol": "EURUSD",
-                "interval": "1h",
-                "prediction_horizon": 6,
-                "predictor_plugin": "default_predictor",
-                "feeder_plugin": "default_feeder",
-                "pipeline_plugin": "default_pipeline",
-                "prediction_type": "short_term"
-            },
-            "expected_model": "predictor_plugin_cnn_candidate_lt",
-            "expected_architecture": "cnn_1d"
+
+def new_client():
+    """
+    AsyncClient with a persistent keep-alive pool, so every request after the
+    first reuses an open connection; concurrent requests share one HTTP/2
+    connection when h2 is installed.
+    """
+    return httpx.AsyncClient(
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        timeout=30.0
+    )
+
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# orjson is several times faster on the numeric prediction arrays; the
+# stdlib json module stands in when it is not installed
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _dumps(obj, sort_keys=False):
+    """Serialize *obj* to compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+    return json.dumps(obj, sort_keys=sort_keys, separators=(',', ':')).encode()
+
+
+# Provider instances to try in order; LTS_PROVIDER_URLS is comma-separated
+BASE_URLS = [
+    url.strip().rstrip('/')
+    for url in os.environ.get("LTS_PROVIDER_URLS", "http://localhost:8000").split(",")
+    if url.strip()
+]
+
+
+async def provider_request(client, method, path, *, headers=None, stream=False, **kwargs):
+    """
+    Send a request to the first provider in BASE_URLS that answers.
+    
+    A connection error or 5xx response moves on to the next URL; the last
+    URL's 5xx response is returned as is. Each request carries an
+    ``X-Attempt`` header with its 1-based attempt number. With
+    ``stream=True`` the body is not read and the caller must ``aclose()``
+    the response. Raises RuntimeError when BASE_URLS is empty.
+    """
+    if not BASE_URLS:
+        raise RuntimeError("no prediction provider URLs configured; set LTS_PROVIDER_URLS")
+    headers = dict(headers or {})
+    last_error = None
+    for attempt, base_url in enumerate(BASE_URLS, 1):
+        headers['X-Attempt'] = str(attempt)
+        request = client.build_request(method, f"{base_url}{path}", headers=headers, **kwargs)
+        try:
+            response = await client.send(request, stream=stream)
+        except httpx.TransportError as e:
+            last_error = e
+            continue
+        if response.status_code >= 500 and attempt < len(BASE_URLS):
+            await response.aclose()
+            continue
+        return response
+    if last_error is None:
+        raise RuntimeError(f"no request was sent for {method} {path}")
+    raise last_error
+
+
+# Prediction requests and the model the provider should select for each
+TEST_CASES = (
+    {
+        "name": "1h interval (CNN model)",
+        "payload": {
+            "symbol": "EURUSD",
+            "interval": "1h",
+            "prediction_horizon": 6,
+            "predictor_plugin": "default_predictor",
+            "feeder_plugin": "default_feeder",
+            "pipeline_plugin": "default_pipeline",
+            "prediction_type": "short_term"
+        },
+        "expected_model": "predictor_plugin_cnn_candidate_lt",
+        "expected_architecture": "cnn_1d"
+    },
+    {
+        "name": "1d interval (Transformer model)",
+        "payload": {
+            "symbol": "EURUSD", 
+            "interval": "1d",
+            "prediction_horizon": 6,
+            "predictor_plugin": "default_predictor",
+            "feeder_plugin": "default_feeder",
+            "pipeline_plugin": "default_pipeline",
+            "prediction_type": "long_term"
         },
-        {
-            "name": "1d interval (Transformer model)",
-            "payload": {
-                "symbol": "EURUSD", 
-                "interval": "1d",
-                "prediction_horizon": 6,
-                "predictor_plugin": "default_predictor",
-                "feeder_plugin": "default_feeder",
-                "pipeline_plugin": "default_pipeline",
-                "prediction_type": "long_term"
-            },
-            "expected_model": "predictor_plugin_transformer",
-            "expected_architecture": "transformer"
-        }
-    ]
+        "expected_model": "predictor_plugin_transformer",
+        "expected_architecture": "transformer"
+    }
+)
+
+# Expected (model, architecture) per case name
+EXPECTED = types.MappingProxyType({
+    tc['name']: (tc['expected_model'], tc['expected_architecture']) for tc in TEST_CASES
+})
+
+
+# Prediction statuses after which polling stops
+TERMINAL_STATUSES = ('completed', 'failed', 'error')
+
+
+async def wait_for_result(client, prediction_id, timeout=5.0, interval=0.1):
+    """
+    Poll a prediction every *interval* seconds until it reaches a terminal status.
     
-    results = []
+    Returns ``(http_status, body)``; a non-200 response ends the poll with a
+    None body. Raises asyncio.TimeoutError if the prediction is still running
+    after *timeout* seconds.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        await asyncio.sleep(interval)
+        response = await provider_request(client, "GET", f"/api/v1/predictions/{prediction_id}")
+        if response.status_code != 200:
+            return response.status_code, None
+        data = _loads(response.content)
+        if data.get('status') in TERMINAL_STATUSES:
+            return response.status_code, data
+        if loop.time() >= deadline:
+            raise asyncio.TimeoutError(
+                f"prediction {prediction_id} still '{data.get('status')}' after {timeout}s"
+            )
+
+
+async def stream_result(client, prediction_id, timeout=5.0):
+    """
+    Wait for a prediction on its server-sent event stream.
+    
+    Returns ``(200, body)`` for the first event with a terminal status, or
+    None when the provider has no stream endpoint, the stream ends early or
+    no terminal event arrives within *timeout* seconds.
+    """
+    path = f"/api/v1/predictions/{prediction_id}/stream"
+    try:
+        async with asyncio.timeout(timeout):
+            response = await provider_request(
+                client, "GET", path, headers={"Accept": "text/event-stream"}, stream=True
+            )
+            try:
+                if response.status_code != 200:
+                    return None
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = _loads(line[5:])
+                    if data.get('status') in TERMINAL_STATUSES:
+                        return response.status_code, data
+            finally:
+                await response.aclose()
+    except TimeoutError:
+        # A stalled stream is not a failed prediction; the caller polls
+        return None
+    return None
+
+
+async def await_result(client, prediction_id):
+    """Wait for a prediction by push where the provider streams it, else by polling."""
+    pushed = await stream_result(client, prediction_id)
+    if pushed is not None:
+        return pushed
+    return await wait_for_result(client, prediction_id)
+
+
+async def _submit_and_wait(client, payload):
+    """POST one prediction request, then poll it if it was accepted."""
+    response = await provider_request(
+        client, "POST", "/api/v1/predict", content=_dumps(payload), headers=JSON_HEADERS
+    )
+    if response.status_code != 200:
+        return response, None, None
+    fetch_status, result_data = await await_result(client, _loads(response.content).get('id'))
+    return response, fetch_status, result_data
+
+
+# Submit-and-poll futures in flight, keyed by payload hash
+INFLIGHT: dict[str, asyncio.Future] = {}
+
+
+async def post_predict(client, payload):
+    """
+    Submit *payload* and wait for its result, sharing one upstream request
+    between concurrent callers with an identical payload.
+    
+    Returns ``(post_response, fetch_status, result_data)``; the last two are
+    None when the POST was not accepted.
+    """
+    key = hashlib.blake2b(_dumps(payload, sort_keys=True)).hexdigest()
+    future = INFLIGHT.get(key)
+    if future is None:
+        future = asyncio.ensure_future(_submit_and_wait(client, payload))
+        INFLIGHT[key] = future
+        future.add_done_callback(lambda _: INFLIGHT.pop(key, None))
+    # shield: one caller being cancelled must not cancel the shared request
+    return await asyncio.shield(future)
+
+
+async def post_batch(client, payloads):
+    """
+    Submit all *payloads* in one POST to /api/v1/predict/batch.
+    
+    Returns the prediction IDs in payload order, or None when the provider
+    rejects the batch with any 4xx other than 401/403 (no batch endpoint, or
+    a batch body it does not accept) so callers fall back to one POST per
+    case. Authentication failures and 5xx responses raise.
+    """
+    response = await provider_request(
+        client, "POST", "/api/v1/predict/batch",
+        content=_dumps({"requests": payloads}), headers=JSON_HEADERS
+    )
+    if 400 <= response.status_code < 500 and response.status_code not in (401, 403):
+        return None
+    response.raise_for_status()
+    ids = _loads(response.content)["ids"]
+    if len(ids) != len(payloads):
+        raise ValueError(f"batch returned {len(ids)} IDs for {len(payloads)} requests")
+    return ids
+
+
+async def run_case(client, test_case, prediction_id=None):
+    """
+    Submit one test case's prediction request and check the result.
     
-    async with aiohttp.ClientSession() as session:
+    When *prediction_id* is given the request was already submitted (see
+    post_batch) and the case only polls for it.
+    
+    Returns ``(result, lines)``; the report lines are buffered so that cases
+    running concurrently do not interleave their output.
+    """
+    lines = []
+    log = lines.append
+    name = test_case['name']
+    horizon = test_case['payload']['prediction_horizon']
+    expected_model, expected_architecture = EXPECTED[name]
+    log(f"\n🔍 Testing: {name}")
+    
+    try:
+        if prediction_id is None:
+            # Submit prediction request and poll until it finishes
+            response, fetch_status, result_data = await post_predict(client, test_case['payload'])
+            
+            if response.status_code != 200:
+                log(f"   ❌ Prediction request failed: {response.status_code}")
+                error_text = response.text
+                log(f"      Error: {error_text}")
+                return {
+                    'test_case': name,
+                    'success': False,
+                    'error': f"Request failed: {response.status_code}"
+                }, lines
+            prediction_response = _loads(response.content)
+        else:
+            # Already submitted through the batch endpoint; only poll
+            prediction_response = {'id': prediction_id, 'status': 'submitted in batch'}
+            fetch_status, result_data = await await_result(client, prediction_id)
         
-        # Test 1: Health check
-        print("\n🔍 Testing health endpoint...")
-        try:
-            async with session.get(f"{base_url}/health") as response:
-                if response.status == 200:
-                    print("✅ Health check passed")
-                    health_data = await response.json()
-                    print(f"   Status: {health_data.get('status', 'unknown')}")
-                else:
-                    print(f"❌ Health check failed: {response.status}")
-                    return False
-        except Exception as e:
-            print(f"❌ Cannot connect to prediction provider: {e}")
-            print("   Make sure the prediction provider is running on http://localhost:8000")
-            return False
+        prediction_id = prediction_response.get('id')
+        
+        log(f"   ✅ Prediction request submitted (ID: {prediction_id})")
+        log(f"      Status: {prediction_response.get('status')}")
         
-        # Test 2: Prediction requests with model selection
-        for test_case in test_cases:
-            print(f"\n🔍 Testing: {test_case['name']}")
+        if fetch_status == 200:
+            # Unpack everything the checks need once
+            status = result_data.get('status')
+            result = result_data.get('result') or {}
+            log(f"      Final status: {status}")
             
-            try:
-                # Submit prediction request
-                async with session.post(
-                    f"{base_url}/api/v1/predict", 
-                    json=test_case['payload']
-                ) as response:
-                    
-                    if response.status == 200:
-                        prediction_response = await response.json()
-                        prediction_id = prediction_response.get('id')
-                        
-                        print(f"   ✅ Prediction request submitted (ID: {prediction_id})")
-                        print(f"      Status: {prediction_response.get('status')}")
-                        
-                        # Wait for processing and check result
-                        await asyncio.sleep(3)  # Give time for processing
-                        
-                        # Get prediction result
-                        async with session.get(
-                            f"{base_url}/api/v1/predictions/{prediction_id}"
-                        ) as result_response:
-                            
-                            if result_response.status == 200:
-                                result_data = await result_response.json()
-                                
-                                print(f"      Final status: {result_data.get('status')}")
-                                
-                                if result_data.get('status') == 'completed':
-                                    result = result_data.get('result', {})
-                                    actual_model = result.get('predictor_plugin')
-                                    model_config = result.get('model_config', {})
-                                    actual_architecture = model_config.get('architecture')
-                                    
-                                    print(f"      Selected model: {actual_model}")
-                                    print(f"      Architecture: {actual_architecture}")
-                                    
-                                    # Verify model selection
-                                    if actual_model == test_case['expected_model']:
-                                        print("      ✅ Correct model selected")
-                                    else:
-                                        print(f"      ❌ Wrong model: expected {test_case['expected_model']}, got {actual_model}")
-                                    
-                                    if actual_architecture == test_case['expected_architecture']:
-                                        print("      ✅ Correct architecture selected")
-                                    else:
-                                        print(f"      ❌ Wrong architecture: expected {test_case['expected_architecture']}, got {actual_architecture}")
-                                    
-                                    # Check prediction output
-                                    predictions = result.get('prediction', [])
-                                    uncertainties = result.get('uncertainty', [])
-                                    
-                                    if len(predictions) == test_case['payload']['prediction_horizon']:
-                                        print(f"      ✅ Correct number of predictions: {len(predictions)}")
-                                    else:
-                                        print(f"      ❌ Wrong prediction count: expected {test_case['payload']['prediction_horizon']}, got {len(predictions)}")
-                                    
-                                    if len(uncertainties) == len(predictions):
-                                        print("      ✅ Uncertainty estimates provided")
-                                    else:
-                                        print("      ❌ Missing uncertainty estimates")
-                                    
-                                    # Store results
-                                    results.append({
-                                        'test_case': test_case['name'],
-                                        'success': True,
-                                        'model_correct': actual_model == test_case['expected_model'],
-                                        'architecture_correct': actual_architecture == test_case['expected_architecture'],
-                                        'prediction_count': len(predictions),
-                                        'uncertainty_count': len(uncertainties)
-                                    })
-                                    
-                                else:
-                                    print(f"      ❌ Prediction failed: {result_data.get('status')}")
-                                    if 'error' in result.get('result', {}):
-                                        print(f"         Error: {result['result']['error']}")
-                                    results.append({
-                                        'test_case': test_case['name'],
-                                        'success': False,
-                                        'error': f"Prediction status: {result_data.get('status')}"
-                                    })
-                            else:
-                                print(f"      ❌ Failed to get result: {result_response.status}")
-                                results.append({
-                                    'test_case': test_case['name'],
-                                    'success': False,
-                                    'error': f"Result fetch failed: {result_response.status}"
-                                })
-                    else:
-                        print(f"   ❌ Prediction request failed: {response.status}")
-                        error_text = await response.text()
-                        print(f"      Error: {error_text}")
-                        results.append({
-                            'test_case': test_case['name'],
-                            'success': False,
-                            'error': f"Request failed: {response.status}"
-                        })
-                        
-            except Exception as e:
-                print(f"   ❌ Test case failed: {e}")
-                results.append({
-                    'test_case': test_case['name'],
+            if status == 'completed':
+                actual_model = result.get('predictor_plugin')
+                actual_architecture = (result.get('model_config') or {}).get('architecture')
+                predictions = result.get('prediction') or ()
+                uncertainties = result.get('uncertainty') or ()
+                n_predictions = len(predictions)
+                n_uncertainties = len(uncertainties)
+                model_correct = actual_model == expected_model
+                architecture_correct = actual_architecture == expected_architecture
+                
+                log(f"      Selected model: {actual_model}")
+                log(f"      Architecture: {actual_architecture}")
+                
+                # Verify model selection
+                if model_correct:
+                    log("      ✅ Correct model selected")
+                else:
+                    log(f"      ❌ Wrong model: expected {expected_model}, got {actual_model}")
+                
+                if architecture_correct:
+                    log("      ✅ Correct architecture selected")
+                else:
+                    log(f"      ❌ Wrong architecture: expected {expected_architecture}, got {actual_architecture}")
+                
+                # Check prediction output
+                if n_predictions == horizon:
+                    log(f"      ✅ Correct number of predictions: {n_predictions}")
+                else:
+                    log(f"      ❌ Wrong prediction count: expected {horizon}, got {n_predictions}")
+                
+                if n_uncertainties == n_predictions:
+                    log("      ✅ Uncertainty estimates provided")
+                else:
+                    log("      ❌ Missing uncertainty estimates")
+                
+                # Store results
+                return {
+                    'test_case': name,
+                    'success': True,
+                    'model_correct': model_correct,
+                    'architecture_correct': architecture_correct,
+                    'prediction_count': n_predictions,
+                    'uncertainty_count': n_uncertainties
+                }, lines
+                
+            else:
+                log(f"      ❌ Prediction failed: {status}")
+                if 'error' in result:
+                    log(f"         Error: {result['error']}")
+                return {
+                    'test_case': name,
                     'success': False,
-                    'error': str(e)
-                })
+                    'error': f"Prediction status: {status}"
+                }, lines
+        else:
+            log(f"      ❌ Failed to get result: {fetch_status}")
+            return {
+                'test_case': name,
+                'success': False,
+                'error': f"Result fetch failed: {fetch_status}"
+            }, lines
+        
+    except Exception as e:
+        log(f"   ❌ Test case failed: {e}")
+        return {
+            'test_case': name,
+            'success': False,
+            'error': str(e)
+        }, lines
+
+
+async def warm_up(client, connections):
+    """
+    Fill the client's pool with *connections* open keep-alive connections by
+    sending that many concurrent health checks; failures are ignored.
+    """
+    await asyncio.gather(
+        *(provider_request(client, "GET", "/health") for _ in range(connections)),
+        return_exceptions=True
+    )
+
+
+def _flush(out):
+    """Write the buffered lines to stdout in one call and clear the buffer."""
+    if out:
+        sys.stdout.write("\n".join(out) + "\n")
+        sys.stdout.flush()
+        out.clear()
+
+
+if pytest is not None:
+    @pytest_asyncio.fixture(scope="module", loop_scope="module")
+    async def http():
+        """One client shared by every test in this module, closed on teardown."""
+        async with new_client() as client:
+            yield client
+
+
+    @pytest_asyncio.fixture(scope="module", loop_scope="module")
+    async def provider(http):
+        """
+        The shared client, once a provider in BASE_URLS passes its health check
+        and the pool is warm; the module's tests are skipped otherwise.
+        """
+        try:
+            response = await provider_request(http, "GET", "/health")
+        except httpx.TransportError as e:
+            pytest.skip(f"prediction provider unreachable at {', '.join(BASE_URLS)}: {e}")
+        if response.status_code != 200:
+            pytest.skip(f"prediction provider health check failed: {response.status_code}")
+        await warm_up(http, len(TEST_CASES))
+        return http
+
+
+    @pytest.mark.asyncio(loop_scope="module")
+    @pytest.mark.parametrize("case", TEST_CASES, ids=lambda case: case['name'])
+    async def test_predict_case(provider, case):
+        """Each case is its own test item, so one failure does not hide another."""
+        result, lines = await run_case(provider, case)
+        print("\n".join(lines))
+        assert result['success'], result.get('error')
+        assert result['model_correct'], "wrong predictor plugin selected"
+        assert result['architecture_correct'], "wrong model architecture selected"
+
+
+async def run_integration(http):
+    """Run every case concurrently and print a full report; used standalone."""
+    
+    # Output is collected per section and written with one call
+    out = []
+    emit = out.append
+    
+    emit("🧪 Testing LTS + Prediction Provider Integration")
+    emit("=" * 60)
+    
+    results = []
+    
+    # Test 1: Health check
+    emit("\n🔍 Testing health endpoint...")
+    try:
+        response = await provider_request(http, "GET", "/health")
+        if response.status_code == 200:
+            emit("✅ Health check passed")
+            health_data = _loads(response.content)
+            emit(f"   Status: {health_data.get('status', 'unknown')}")
+        else:
+            emit(f"❌ Health check failed: {response.status_code}")
+            _flush(out)
+            return False
+    except Exception as e:
+        emit(f"❌ Cannot connect to prediction provider: {e}")
+        emit(f"   Make sure the prediction provider is running on {', '.join(BASE_URLS)}")
+        _flush(out)
+        return False
+    
+    _flush(out)
+    
+    # Open one keep-alive connection per concurrent case before the cases
+    # start, so no case pays the connection setup
+    await warm_up(http, len(TEST_CASES))
+    
+    # Test 2: Prediction requests with model selection; the cases are
+    # independent, so they run concurrently on the shared client
+    prediction_ids = await post_batch(http, [tc['payload'] for tc in TEST_CASES])
+    if prediction_ids is None:
+        prediction_ids = [None] * len(TEST_CASES)
+    outcomes = await asyncio.gather(
+        *[run_case(http, tc, pid) for tc, pid in zip(TEST_CASES, prediction_ids)],
+        return_exceptions=True
+    )
+    
+    # Report each case in submission order, whatever order they finished in
+    for test_case, outcome in zip(TEST_CASES, outcomes):
+        if isinstance(outcome, BaseException):
+            emit(f"\n🔍 Testing: {test_case['name']}")
+            emit(f"   ❌ Test case failed: {outcome}")
+            results.append({
+                'test_case': test_case['name'],
+                'success': False,
+                'error': str(outcome)
+            })
+            continue
+        result, lines = outcome
+        out.extend(lines)
+        results.append(result)
+    
+    _flush(out)
     
     # Print summary
-    print("\n" + "=" * 60)
-    print("📊 Test Results Summary:")
+    emit("\n" + "=" * 60)
+    emit("📊 Test Results Summary:")
     
-    successful_tests = [r for r in results if r.get('success', False)]
-    failed_tests = [r for r in results if not r.get('success', False)]
+    successful_tests, failed_tests = [], []
+    for r in results:
+        (successful_tests if r.get('success', False) else failed_tests).append(r)
     
-    print(f"   ✅ Successful tests: {len(successful_tests)}/{len(results)}")
-    print(f"   ❌ Failed tests: {len(failed_tests)}/{len(results)}")
+    emit(f"   ✅ Successful tests: {len(successful_tests)}/{len(results)}")
+    emit(f"   ❌ Failed tests: {len(failed_tests)}/{len(results)}")
     
     if failed_tests:
-        print("\n🚨 Failed Tests:")
+        emit("\n🚨 Failed Tests:")
         for test in failed_tests:
-            print(f"   - {test['test_case']}: {test.get('error', 'Unknown error')}")
+            emit(f"   - {test['test_case']}: {test.get('error', 'Unknown error')}")
     
     if successful_tests:
-        print("\n🎉 Successful Tests:")
+        emit("\n🎉 Successful Tests:")
         for test in successful_tests:
-            print(f"   - {test['test_case']}")
+            emit(f"   - {test['test_case']}")
             if test.get('model_correct') and test.get('architecture_correct'):
-                print("     ✅ Model selection working correctly")
+                emit("     ✅ Model selection working correctly")
             else:
-                print("     ⚠️ Model selection issues detected")
+                emit("     ⚠️ Model selection issues detected")
     
     # Overall result
     all_passed = len(successful_tests) == len(results)
     if all_passed:
-        print("\n🎯 Overall Result: ✅ ALL TESTS PASSED")
-        print("   LTS + Prediction Provider integration is working correctly!")
-        print("   - Model selection logic functioning properly")
-        print("   - 1h interval → CNN model")
-        print("   - 1d interval → Transformer model")
-        print("   - Prediction horizons correctly handled")
+        emit("\n🎯 Overall Result: ✅ ALL TESTS PASSED")
+        emit("   LTS + Prediction Provider integration is working correctly!")
+        emit("   - Model selection logic functioning properly")
+        emit("   - 1h interval → CNN model")
+        emit("   - 1d interval → Transformer model")
+        emit("   - Prediction horizons correctly handled")
     else:
-        print("\n🎯 Overall Result: ❌ SOME TESTS FAILED")
-        print("   Please check the failed tests and fix any issues.")
+        emit("\n🎯 Overall Result: ❌ SOME TESTS FAILED")
+        emit("   Please check the failed tests and fix any issues.")
     
+    _flush(out)
     return all_passed
 
+
+async def main():
+    """Run the integration test standalone, outside pytest."""
+    async with new_client() as client:
+        return await run_integration(client)
+
+
 if __name__ == "__main__":
-    result = asyncio.run(test_prediction_provider_integration())
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    result = asyncio.run(main())
     sys.exit(0 if result else 1)
@@ -11,26 +11,64 @@ import os
 import sys
 import tempfile
 import asyncio
-from unittest.mock import Mock, MagicMock, patch
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
-from app.config_handler import ConfigHandler
-from app.database import Database, db_session, Base, SyncSessionLocal, get_db
-from fastapi.testclient import TestClient
-from plugins_core.default_core import CorePlugin
-from fastapi import FastAPI, Depends
-import json
+import contextlib
+import copy
+import functools
+from types import SimpleNamespace
+from unittest.mock import patch
+
+try:
+    import bcrypt
+except ImportError:
+    bcrypt = None
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-@pytest.fixture(scope="function")
+# LTS_TEST_TMPDIR (e.g. /dev/shm on CI) moves tmp_path and tempfile files
+# to a RAM-backed directory
+if os.environ.get("LTS_TEST_TMPDIR"):
+    tempfile.tempdir = os.environ["LTS_TEST_TMPDIR"]
+
+@functools.lru_cache(maxsize=1)
+def _lazy_imports():
+    """
+    FastAPI, SQLAlchemy and the app modules, imported on first fixture use
+    so that collection-only runs do not pay for them.
+    """
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from app.config_handler import ConfigHandler
+    from app.database import Database, Base, get_db
+    from plugins_core.default_core import CorePlugin
+    return SimpleNamespace(
+        create_engine=create_engine,
+        event=event,
+        sessionmaker=sessionmaker,
+        StaticPool=StaticPool,
+        create_async_engine=create_async_engine,
+        FastAPI=FastAPI,
+        TestClient=TestClient,
+        ConfigHandler=ConfigHandler,
+        Database=Database,
+        Base=Base,
+        get_db=get_db,
+        CorePlugin=CorePlugin,
+    )
+
+@pytest.fixture(scope="session")
 def app(fresh_db, mock_config):
-    """Create a FastAPI app for testing, with a fresh database."""
-    import sys as _sys
-    print(f"\n[DEBUG] fresh_db type: {type(fresh_db)}, db_url: {getattr(fresh_db, 'db_url', 'N/A')}", file=_sys.stderr)
-    
-    core_plugin = CorePlugin()
+    """
+    Create the FastAPI app once per session. Requests get the current
+    test's db_session; outside a test, get_db opens a session that is
+    rolled back when the request ends.
+    """
+    lazy = _lazy_imports()
+    core_plugin = lazy.CorePlugin()
     
     # This is a simplified version of the dependency override
     # In a real app, you'd likely have a more robust way to manage this
@@ -40,20 +78,10 @@ def app(fresh_db, mock_config):
 
     def get_sync_test_db():
         """Provides a synchronous session for plugins that need it."""
-        # This uses the same underlying database file as the async session
-        # but with a separate synchronous engine.
-        sync_engine = create_engine(
-            fresh_db.db_url.replace('+aiosqlite', ''), 
-            connect_args={"check_same_thread": False}
-        )
-        TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)
-        db = TestSessionLocal()
-        try:
+        with _rollback_session(fresh_db.sync_engine) as db:
             yield db
-        finally:
-            db.close()
 
-    app = FastAPI()
+    app = lazy.FastAPI()
     
     # Initialize the core plugin, which sets up its routes
     core_plugin.initialize(
@@ -63,87 +91,197 @@ def app(fresh_db, mock_config):
         get_db=get_sync_test_db # Pass the sync session provider
     )
     
-    # Ensure all tables are created on the sync engine as well
-    sync_engine = create_engine(
-        fresh_db.db_url.replace('+aiosqlite', ''), 
-        connect_args={"check_same_thread": False}
-    )
-    Base.metadata.create_all(bind=sync_engine)
-
-
     # Override the dependencies in the core plugin's router
-    app.dependency_overrides[get_db] = get_sync_test_db
+    app.dependency_overrides[lazy.get_db] = get_sync_test_db
     
     app.include_router(core_plugin.router)
     
     # Add a reference to the database object to the app for tests that need it
     app.database = fresh_db
+    app.core_plugin = core_plugin
     
     return app
 
+@pytest.fixture(scope="session")
+def session_client(app):
+    """TestClient whose lifespan spans the whole session."""
+    with _lazy_imports().TestClient(app) as c:
+        yield c
+
+@contextlib.contextmanager
+def _restored(mapping):
+    """Put *mapping* back to its current contents on exit."""
+    saved = copy.deepcopy(dict(mapping))
+    try:
+        yield mapping
+    finally:
+        mapping.clear()
+        mapping.update(saved)
+
+@pytest.fixture(scope="function")
+def app_state(app, mock_config):
+    """
+    Undo what a test changes on the session app: dependency overrides, the
+    core plugin's config (login attempt counters live there) and its
+    simulated failures.
+    """
+    with _restored(app.dependency_overrides), _restored(mock_config), \
+            _restored(app.core_plugin._test_mode_failures):
+        yield app
+
 @pytest.fixture(scope="function")
-def client(app):
-    """Create a TestClient for the app."""
-    with TestClient(app) as c:
+def client(app_state, session_client, db_session):
+    """
+    The shared TestClient, with requests using this test's db_session.
+    App state a test changes is undone afterwards instead of rebuilding
+    the app.
+    """
+    yield session_client
+
+@pytest.fixture(scope="function")
+async def async_client(app_state, db_session):
+    """
+    httpx AsyncClient calling the session app in the test's own event loop,
+    for async tests. Like client, requests use this test's db_session and
+    app state a test changes is undone afterwards.
+    """
+    import httpx
+
+    transport = httpx.ASGITransport(app=app_state)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
         yield c
 
+@pytest.fixture(scope="function")
+def db_session(app, fresh_db):
+    """
+    Session inside a transaction that is rolled back after the test. Commits
+    made by the app only release a SAVEPOINT, so each test starts from the
+    empty schema.
+    """
+    get_db = _lazy_imports().get_db
+    with _rollback_session(fresh_db.sync_engine) as db:
+        def get_test_db():
+            yield db
+
+        default_get_db = app.dependency_overrides[get_db]
+        app.dependency_overrides[get_db] = get_test_db
+        try:
+            yield db
+        finally:
+            app.dependency_overrides[get_db] = default_get_db
+
+@contextlib.contextmanager
+def _rollback_session(engine):
+    """
+    Session inside a transaction that is rolled back on exit. Commits only
+    release a SAVEPOINT, so nothing written through it outlives the block.
+    """
+    conn = engine.connect()
+    trans = conn.begin()
+    db = _lazy_imports().sessionmaker(
+        bind=conn,
+        autocommit=False,
+        autoflush=False,
+        join_transaction_mode="create_savepoint"
+    )()
+    try:
+        yield db
+    finally:
+        db.close()
+        trans.rollback()
+        conn.close()
+
+# Test databases are throwaway, so skip journaling and syncing
+_TEST_PRAGMAS = (
+    "PRAGMA synchronous=OFF",
+    "PRAGMA journal_mode=MEMORY",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA locking_mode=EXCLUSIVE",
+    "PRAGMA cache_size=-64000",
+)
+
+def _set_test_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma in _TEST_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+# Named in-memory database shared by every connection in the process that
+# opens it (each xdist worker is its own process)
+_SHARED_MEMORY_DB = "file:lts_test?mode=memory&cache=shared&uri=true"
+
 # Note: event_loop fixture is provided by pytest-asyncio.
 # Do not override it — the deprecated redefinition was removed.
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def fresh_db():
-    """Create a fresh database for each test function."""
-    import asyncio
-    with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as temp_file:
-        db_path = temp_file.name
-    
-    db = Database(db_path=db_path)
+    """
+    Create the in-memory test database once per session; db_session keeps
+    tests isolated by rolling back each test's transaction. Every fixture
+    reaches the sync engine through _rollback_session.
+
+    The sync and async engines open the same named shared-cache in-memory
+    database, so both see the same schema and rows. Commits made through
+    the async engine (get_session, fetch_all, execute_sql) are not rolled
+    back.
+    """
+    lazy = _lazy_imports()
+    event = lazy.event
+    db = lazy.Database(db_path=':memory:')
     
-    # Initialize synchronously using the sync engine
-    from sqlalchemy import create_engine as _ce
-    _sync_url = db.db_url.replace('+aiosqlite', '')
-    _engine = _ce(_sync_url, connect_args={"check_same_thread": False})
-    Base.metadata.create_all(bind=_engine)
-    _engine.dispose()
+    # The routes use synchronous sessions. StaticPool keeps a single
+    # connection per engine; the database lives while either is open.
+    db.sync_engine = lazy.create_engine(
+        f"sqlite:///{_SHARED_MEMORY_DB}",
+        connect_args={"check_same_thread": False},
+        poolclass=lazy.StaticPool
+    )
+
+    # pysqlite's own transaction handling breaks SAVEPOINT; let SQLAlchemy emit BEGIN
+    @event.listens_for(db.sync_engine, "connect")
+    def _disable_pysqlite_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(db.sync_engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    event.listen(db.sync_engine, "connect", _set_test_pragmas)
+    lazy.Base.metadata.create_all(bind=db.sync_engine)
+
+    # Database(':memory:') opens a new, private database per async
+    # connection; point it at the shared one, which already has the schema
+    db.engine = lazy.create_async_engine(
+        f"sqlite+aiosqlite:///{_SHARED_MEMORY_DB}",
+        connect_args={"check_same_thread": False},
+        poolclass=lazy.StaticPool
+    )
+    db.SessionLocal.configure(bind=db.engine)
+    event.listen(db.engine.sync_engine, "connect", _set_test_pragmas)
     
     yield db
     
-    try:
-        os.unlink(db_path)
-    except FileNotFoundError:
-        pass
+    db.sync_engine.dispose()
+    asyncio.run(db.engine.dispose())
 
 
 @pytest.fixture(scope="function")
 def app_with_config(fresh_db):
     """Create a FastAPI app with a specific test configuration."""
+    lazy = _lazy_imports()
     with patch.dict(os.environ, {"LTS_DATABASE_PATH": "test_db_from_env.sqlite"}):
-        # Create temporary config files
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json') as f_default:
-            json.dump({"DEFAULT_SETTING": "file_value", "LOG_LEVEL": "INFO"}, f_default)
-            default_config_path = f_default.name
-
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json') as f_override:
-            json.dump({"LOG_LEVEL": "DEBUG"}, f_override)
-            override_config_path = f_override.name
-
-        config_handler = ConfigHandler(default_file_path=default_config_path, override_file_path=override_config_path)
+        config_handler = lazy.ConfigHandler.from_dicts(
+            {"DEFAULT_SETTING": "file_value", "LOG_LEVEL": "INFO"},
+            {"LOG_LEVEL": "DEBUG"}
+        )
         config = config_handler.get_config()
 
-        core_plugin = CorePlugin()
-        app = FastAPI()
+        core_plugin = lazy.CorePlugin()
+        app = lazy.FastAPI()
 
         def get_sync_test_db():
-            sync_engine = create_engine(
-                fresh_db.db_url.replace('+aiosqlite', ''),
-                connect_args={"check_same_thread": False}
-            )
-            TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)
-            db = TestSessionLocal()
-            try:
+            with _rollback_session(fresh_db.sync_engine) as db:
                 yield db
-            finally:
-                db.close()
 
         core_plugin.initialize(
             plugins={'core': core_plugin},
@@ -152,15 +290,12 @@ def app_with_config(fresh_db):
             get_db=get_sync_test_db
         )
 
+        app.dependency_overrides[lazy.get_db] = get_sync_test_db
         app.include_router(core_plugin.router)
         app.config = config  # Attach config for easy access in tests
 
         yield app
 
-    # Cleanup config files
-    os.unlink(default_config_path)
-    os.unlink(override_config_path)
-
 @pytest.fixture(scope="session")
 def mock_config():
     """Create a mock configuration for testing."""
@@ -184,173 +319,47 @@ def mock_config():
         }
     }
 
-@pytest.fixture(scope="session")
-def mock_plugin_loader():
-    """Create a mock plugin loader for testing."""
-    loader = Mock()
-    loader.load_plugins = Mock()
-    loader.shutdown_plugins = Mock()
-    return loader
-
-@pytest.fixture
-def mock_database():
-    """Create a mock database for testing."""
-    db = Mock()
-    db.initialize = Mock(return_value=True)
-    db.cleanup = Mock()
-    db.execute_sql = Mock()
-    db.get_connection = Mock()
-    return db
-
-@pytest.fixture
-def mock_plugins():
-    """Create a set of mock plugins for testing."""
-    plugins = {}
-    
-    # Mock AAA plugin
-    mock_aaa = Mock()
-    mock_aaa.initialize = Mock(return_value=True)
-    mock_aaa.authenticate = Mock(return_value={'status': 'success', 'user_id': 'test_user'})
-    mock_aaa.authorize = Mock(return_value=True)
-    mock_aaa.log_activity = Mock()
-    mock_aaa.cleanup = Mock()
-    plugins['aaa'] = mock_aaa
-    
-    # Mock Strategy plugin
-    mock_strategy = Mock()
-    mock_strategy.initialize = Mock(return_value=True)
-    mock_strategy.process_market_data = Mock(return_value={'signal': 'BUY', 'confidence': 0.8})
-    mock_strategy.cleanup = Mock()
-    plugins['strategy'] = mock_strategy
-    
-    # Mock Broker plugin
-    mock_broker = Mock()
-    mock_broker.initialize = Mock(return_value=True)
-    mock_broker.execute_order = Mock(return_value={'order_id': 'ORD123', 'status': 'FILLED'})
-    mock_broker.cleanup = Mock()
-    plugins['broker'] = mock_broker
-    
-    # Mock Portfolio plugin
-    mock_portfolio = Mock()
-    mock_portfolio.initialize = Mock(return_value=True)
-    mock_portfolio.update_position = Mock(return_value={'position': 100, 'pnl': 150.0})
-    mock_portfolio.cleanup = Mock()
-    plugins['portfolio'] = mock_portfolio
-    
-    return plugins
-
-@pytest.fixture
-def sample_market_data():
-    """Create sample market data for testing."""
-    return {
-        'AAPL': {
-            'price': 150.00,
-            'volume': 1000000,
-            'timestamp': 1640995200,
-            'prices': [148.0, 149.0, 150.0, 151.0, 150.5] * 10  # 50 prices for SMA
-        },
-        'GOOGL': {
-            'price': 2800.00,
-            'volume': 500000,
-            'timestamp': 1640995200,
-            'prices': [2750.0, 2780.0, 2800.0, 2820.0, 2810.0] * 10
-        }
-    }
-
-@pytest.fixture
-def sample_user_data():
-    """Create sample user data for testing."""
-    return {
-        'admin_user': {
-            'username': 'admin',
-            'email': 'admin@example.com',
-            'role': 'admin',
-            'permissions': ['read', 'write', 'delete', 'manage_users']
-        },
-        'trader_user': {
-            'username': 'trader',
-            'email': 'trader@example.com',
-            'role': 'trader',
-            'permissions': ['read', 'write', 'trade']
-        },
-        'readonly_user': {
-            'username': 'readonly',
-            'email': 'readonly@example.com',
-            'role': 'readonly',
-            'permissions': ['read']
-        }
-    }
-
-@pytest.fixture
-def sample_portfolio_data():
-    """Create sample portfolio data for testing."""
-    return {
-        'portfolio_1': {
-            'id': 1,
-            'name': 'Growth Portfolio',
-            'user_id': 'trader_user',
-            'balance': 100000.0,
-            'assets': ['AAPL', 'GOOGL', 'MSFT'],
-            'positions': {
-                'AAPL': {'quantity': 100, 'avg_price': 148.0},
-                'GOOGL': {'quantity': 10, 'avg_price': 2750.0}
-            }
-        },
-        'portfolio_2': {
-            'id': 2,
-            'name': 'Conservative Portfolio',
-            'user_id': 'trader_user',
-            'balance': 50000.0,
-            'assets': ['BOND', 'CASH'],
-            'positions': {
-                'BOND': {'quantity': 500, 'avg_price': 98.0}
-            }
-        }
-    }
-
-# Test markers for categorizing tests
-def pytest_configure(config):
-    """Configure pytest markers."""
-    config.addinivalue_line(
-        "markers", "unit: mark test as a unit test"
-    )
-    config.addinivalue_line(
-        "markers", "integration: mark test as an integration test"
-    )
-    config.addinivalue_line(
-        "markers", "system: mark test as a system test"
-    )
-    config.addinivalue_line(
-        "markers", "acceptance: mark test as an acceptance test"
-    )
-    config.addinivalue_line(
-        "markers", "slow: mark test as slow running"
-    )
-    config.addinivalue_line(
-        "markers", "security: mark test as security-related"
-    )
-    config.addinivalue_line(
-        "markers", "performance: mark test as performance-related"
-    )
+@pytest.fixture(scope="session", autouse=True)
+def fast_password_hashing():
+    """
+    Use the minimum bcrypt cost (4) for the whole session. Hashes keep the
+    bcrypt format and checkpw reads the cost from the hash, so only the
+    key-derivation time changes.
+    """
+    if bcrypt is None:
+        yield
+        return
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(bcrypt, "gensalt", functools.partial(bcrypt.gensalt, rounds=4))
+        yield
 
 # Pytest collection hooks
+# Markers added by test location, checked in order; first match wins
+_LOCATION_MARKERS = (
+    ("unit", pytest.mark.unit),
+    ("integration", pytest.mark.integration),
+    ("system", pytest.mark.system),
+    ("acceptance", pytest.mark.acceptance),
+)
+# Name fragments that mark a test as slow or security-related
+_SLOW_KEYWORDS = ('performance', 'stress', 'load')
+_SECURITY_KEYWORDS = ('security', 'auth', 'permission')
+
 def pytest_collection_modifyitems(config, items):
     """Modify test items during collection."""
     for item in items:
         # Add markers based on test location
-        if "unit" in str(item.fspath):
-            item.add_marker(pytest.mark.unit)
-        elif "integration" in str(item.fspath):
-            item.add_marker(pytest.mark.integration)
-        elif "system" in str(item.fspath):
-            item.add_marker(pytest.mark.system)
-        elif "acceptance" in str(item.fspath):
-            item.add_marker(pytest.mark.acceptance)
+        path = item.nodeid.partition("::")[0]
+        for fragment, marker in _LOCATION_MARKERS:
+            if fragment in path:
+                item.add_marker(marker)
+                break
         
+        name = item.name.lower()
         # Add slow marker to tests that might be slow
-        if any(keyword in item.name.lower() for keyword in ['performance', 'stress', 'load']):
+        if any(keyword in name for keyword in _SLOW_KEYWORDS):
             item.add_marker(pytest.mark.slow)
         
         # Add security marker to security tests
-        if any(keyword in item.name.lower() for keyword in ['security', 'auth', 'permission']):
+        if any(keyword in name for keyword in _SECURITY_KEYWORDS):
             item.add_marker(pytest.mark.security)
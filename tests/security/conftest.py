@@ -9,26 +9,28 @@ os.environ["LTS_QUIET"] = "1"
 _LTS_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
 sys.path.insert(0, _LTS_ROOT)
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from app.database import Base, User, Session as UserSession, AuditLog, Portfolio, BillingRecord
-
-TEST_DB_URL = "sqlite:///./lts_security_test.db"
-
 @pytest.fixture(scope="module")
-def test_engine():
-    engine = create_engine(TEST_DB_URL, connect_args={"check_same_thread": False})
+def test_engine(tmp_path_factory):
+    # Imported here so collection alone does not load SQLAlchemy and the app
+    from sqlalchemy import create_engine
+    from app.database import Base
+    # tmp_path_factory directories are per xdist worker, so parallel
+    # modules never share the database file
+    db_path = tmp_path_factory.mktemp("security_db") / "lts_security_test.db"
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
     Base.metadata.create_all(bind=engine)
     yield engine
     Base.metadata.drop_all(bind=engine)
 
 @pytest.fixture(scope="module")
 def TestSession(test_engine):
+    from sqlalchemy.orm import sessionmaker
     return sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
 
 @pytest.fixture(autouse=True)
 def clean_db(test_engine):
     """Clean all tables before each test."""
+    from app.database import Base
     Base.metadata.create_all(bind=test_engine)
     yield
     # Don't drop - just clean
@@ -22,6 +22,11 @@ from app.plugin_loader import load_plugin
 # Mark all tests in this file as system tests
 pytestmark = pytest.mark.system
 
+@pytest.fixture
+def anyio_backend():
+    """async_client runs on pytest-asyncio's event loop, so anyio tests here use asyncio."""
+    return "asyncio"
+
 # Helper function to run the trading pipeline
 async def run_pipeline(client):
     """Helper to trigger the pipeline execution endpoint."""
@@ -73,29 +78,29 @@ def test_end_to_end_pipeline(test_id, description, client, fresh_db):
     ("SYS-002", "Multi-Portfolio Concurrent Execution"),
 ])
 @pytest.mark.anyio
-async def test_multi_portfolio_concurrency(test_id, description, client, fresh_db):
+async def test_multi_portfolio_concurrency(test_id, description, async_client, fresh_db):
     """
     Tests the system's ability to handle multiple active portfolios executing concurrently.
     """
+    client = async_client
     # 1. Configure 10 portfolios across 5 users
     user_ids = []
     for i in range(5):
-        res = client.post('/users/create', json={'username': f'user{i}', 'password': 'ValidPassword123!'})
+        res = await client.post('/users/create', json={'username': f'user{i}', 'password': 'ValidPassword123!'})
         user_ids.append(res.json()['user']['id'])
 
     portfolio_ids = []
     for i in range(10):
-        res = client.post('/portfolios/create', json={'user_id': user_ids[i % 5], 'name': f'Portfolio {i}', 'assets': ['BTC']})
+        res = await client.post('/portfolios/create', json={'user_id': user_ids[i % 5], 'name': f'Portfolio {i}', 'assets': ['BTC']})
         portfolio_id = res.json()['portfolio']['id']
-        client.put(f'/portfolios/{portfolio_id}/activate')
+        await client.put(f'/portfolios/{portfolio_id}/activate')
         portfolio_ids.append(portfolio_id)
 
     # 4. Trigger concurrent execution
     start_time = time.time()
-    # The TestClient is synchronous, so we can't use asyncio.gather directly with it.
-    # We will send requests sequentially, which is a limitation of TestClient.
-    # For true concurrency testing, a tool like httpx with an AsyncClient would be needed against a running server.
-    responses = [client.post('/pipeline/execute') for _ in portfolio_ids]
+    # Requests are awaited one at a time: every request in a test shares the
+    # test's database session, which must not be used from two threads at once.
+    responses = [await client.post('/pipeline/execute') for _ in portfolio_ids]
     end_time = time.time()
 
     for res in responses:
@@ -188,26 +193,27 @@ def test_input_validation(test_id, description, client, fresh_db):
     ("SYS-011", "Error Handling and Fault Tolerance"),
 ])
 @pytest.mark.anyio
-async def test_error_handling(test_id, description, client, mocker, fresh_db):
+async def test_error_handling(test_id, description, async_client, mocker, fresh_db):
     """
     Tests that the system handles various failure scenarios gracefully.
     """
+    client = async_client
     # Reset any previous failure simulations
-    client.post('/test/reset-failures')
+    await client.post('/test/reset-failures')
     
     # Enable database failure simulation
-    response = client.post('/test/simulate-db-failure')
+    response = await client.post('/test/simulate-db-failure')
     assert response.status_code == 200
     assert "Database failure simulation enabled" in response.json()['status']
     
     # Test that database failure is properly handled
-    response = client.post('/users/create', json={'username': 'test', 'password': 'ValidPassword123!'})
+    response = await client.post('/users/create', json={'username': 'test', 'password': 'ValidPassword123!'})
     assert response.status_code == 500
     assert "Database connection failed" in response.json()['detail']
 
     # Reset failures and ensure other endpoints still work
-    client.post('/test/reset-failures')
-    response = client.get('/plugins/list')
+    await client.post('/test/reset-failures')
+    response = await client.get('/plugins/list')
     assert response.status_code == 200
 
 @pytest.mark.parametrize("test_id, description", [
@@ -269,6 +269,69 @@ class TestCSVWorkflowEndToEnd:
                 print(f"Prediction failed for {timestamp}: {e}")
                 continue
     
+    def test_binary_sidecar_reuse(self, temp_csv_file):
+        """A predictor loads the sidecars from write_sidecars() instead of the CSV."""
+        from predictor_plugins.csv_predictor import CSVPredictor, write_sidecars
+
+        predictor_config = {
+            "csv_file": temp_csv_file,
+            "prediction_horizons": ["1h", "1d"],
+            "close_column": "CLOSE"
+        }
+        sidecars = (f"{temp_csv_file}.parquet", f"{temp_csv_file}.CLOSE.npy")
+
+        first = CSVPredictor(predictor_config)
+        assert not any(os.path.exists(path) for path in sidecars)
+
+        write_sidecars(temp_csv_file)
+        try:
+            assert all(os.path.exists(path) for path in sidecars)
+            with patch('predictor_plugins.csv_predictor.read_csv') as read_csv:
+                second = CSVPredictor(predictor_config)
+                read_csv.assert_not_called()
+
+            timestamp = datetime(2023, 1, 3, 18, 0, 0)
+            assert first.predict(timestamp) == second.predict(timestamp)
+            assert first.data.index.equals(second.data.index)
+        finally:
+            for path in sidecars:
+                os.unlink(path)
+
+    def test_predict_batch_matches_predict(self, temp_csv_file):
+        """Batch predictions equal one predict() call per timestamp."""
+        from predictor_plugins.csv_predictor import CSVPredictor
+
+        predictor = CSVPredictor({
+            "csv_file": temp_csv_file,
+            "prediction_horizons": ["1h", "6h", "1d"],
+            "close_column": "CLOSE"
+        })
+
+        timestamps = [datetime(2023, 1, 2, 12, 0, 0) + timedelta(hours=i) for i in range(0, 300, 7)]
+        batch = predictor.predict_batch(timestamps)
+
+        assert len(batch) == len(timestamps)
+        for timestamp, result in zip(timestamps, batch):
+            assert result == predictor.predict(timestamp)
+        assert predictor.predict_batch([]) == []
+
+    def test_nearest_lookup_matches_get_indexer(self, temp_csv_file):
+        """searchsorted lookup agrees with get_indexer(method='nearest'), ties included."""
+        from predictor_plugins.csv_predictor import CSVPredictor, _nearest_idx
+
+        predictor = CSVPredictor({
+            "csv_file": temp_csv_file,
+            "prediction_horizons": ["1h"],
+            "close_column": "CLOSE"
+        })
+        index = predictor.data.index
+
+        targets = [datetime(2022, 12, 31), datetime(2023, 2, 1),
+                   datetime(2023, 1, 3, 18, 0, 0), datetime(2023, 1, 3, 18, 30, 0),
+                   datetime(2023, 1, 3, 18, 29, 59), datetime(2023, 1, 5, 6, 45, 0)]
+        expected = index.get_indexer(pd.DatetimeIndex(targets), method="nearest")
+        assert [_nearest_idx(predictor._index_i8, t) for t in targets] == list(expected)
+
     def test_csv_data_validation_workflow(self, temp_csv_file):
         """Test data validation throughout the CSV workflow."""
         from feeder_plugins.csv_feeder import CSVFeeder
@@ -82,6 +82,13 @@ class TestHeuristicStrategy:
         result = compute_signal(current_price=1.10, daily_predictions=[], hourly_predictions=[])
         assert result["action"] == "hold"
 
+    def test_hold_flat_predictions(self):
+        from plugins_strategy.heuristic_strategy import compute_signal
+        # Moves of 2 pips either way stay under the 5-pip profit threshold
+        result = compute_signal(current_price=1.10000, daily_predictions=[1.10002, 1.09998, 1.10001])
+        assert result["action"] == "hold"
+        assert result["reason"] == "no signal meets threshold"
+
     def test_buy_signal(self):
         from plugins_strategy.heuristic_strategy import compute_signal
         # Daily predictions show price going up significantly
@@ -103,6 +110,23 @@ class TestHeuristicStrategy:
         assert result["tp"] < current
         assert result["sl"] > current
 
+    def test_signal_core_matches_compute_signal(self):
+        from array import array
+        from plugins_strategy.heuristic_strategy import compute_signal, _signal_core, DEFAULT_PARAMS
+        current = 1.10000
+        daily_preds = [1.10100, 1.09950, 1.10600, 1.10300]
+        side, tp, sl, rr, profit_pips = _signal_core(
+            array('d', daily_preds), current, DEFAULT_PARAMS['pip_cost'],
+            DEFAULT_PARAMS['profit_threshold'], DEFAULT_PARAMS['min_drawdown_pips'],
+            DEFAULT_PARAMS['tp_multiplier'], DEFAULT_PARAMS['sl_multiplier'],
+        )
+        result = compute_signal(current_price=current, daily_predictions=daily_preds)
+        assert side == 1 and result["action"] == "buy"
+        assert result["tp"] == pytest.approx(tp)
+        assert result["sl"] == pytest.approx(sl)
+        assert result["rr"] == pytest.approx(rr)
+        assert profit_pips == pytest.approx(600.0)
+
     def test_early_close_long_variant_e(self):
         from plugins_strategy.heuristic_strategy import should_early_close
         # Weighted min below SL should trigger close
@@ -205,6 +229,62 @@ class TestHeartbeat:
         assert result["portfolios_processed"] == 1
 
 
+# ---- Prediction client tests ----
+
+class TestPredictionClient:
+    """Test PredictionProviderClient against a mocked HTTP transport."""
+
+    @pytest.mark.asyncio
+    async def test_shared_client_is_reused(self):
+        """An injected httpx client serves every request and is left open."""
+        import httpx
+        from app.prediction_client import PredictionProviderClient
+
+        seen = []
+
+        def handler(request):
+            seen.append((request.method, request.url.path))
+            if request.method == "POST":
+                return httpx.Response(201, json={"id": 7, "status": "pending"})
+            return httpx.Response(200, json={"status": "completed", "result": {"prediction": [1.1, 1.2]}})
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+            client = PredictionProviderClient({"prediction_provider_url": "http://pp"}, client=http)
+            result = await client.get_predictions("EURUSD", "2023-01-15T10:00:00", ["short_term"])
+            assert not http.is_closed
+
+        assert result["status"] == "success"
+        assert result["predictions"]["short_term"] == [1.1, 1.2]
+        assert seen == [("POST", "/api/v1/predict"), ("GET", "/api/v1/predictions/7")]
+
+
+    @pytest.mark.asyncio
+    async def test_csv_mode_shares_parsed_file(self, tmp_path):
+        """Clients in CSV test mode reuse one parsed frame per (path, mtime)."""
+        import pandas as pd
+        from app.prediction_client import PredictionProviderClient
+
+        index = pd.date_range("2023-01-01", periods=48, freq="h")
+        close = [1.1 + i * 0.0001 for i in range(48)]
+        csv_path = tmp_path / "prices.csv"
+        pd.DataFrame({
+            "DATE_TIME": index, "OPEN": close, "HIGH": close, "LOW": close, "CLOSE": close,
+        }).to_csv(csv_path, index=False)
+
+        config = {"csv_test_mode": True, "csv_test_data_path": str(csv_path)}
+        first = PredictionProviderClient(config)
+        second = PredictionProviderClient(config)
+        assert first.csv_data is second.csv_data
+
+        result = await second.get_predictions("EURUSD", "2023-01-01T05:00:00", ["short_term"])
+        assert result["predictions"]["short_term"] == pytest.approx(close[6:12])
+
+        # Pre-parsed datetimes and non-ISO strings resolve to the same row
+        from datetime import datetime
+        for when in (datetime(2023, 1, 1, 5), "Jan 1 2023 05:00"):
+            other = await second.get_predictions("EURUSD", when, ["short_term"])
+            assert other["predictions"]["short_term"] == result["predictions"]["short_term"]
+
 # ---- Auth + API integration test ----
 
 class TestAuthIntegration: